@@ -2,47 +2,112 @@
 FastAPI Authentication API for EZ Common
 Handles user registration and login with DynamoDB backend
 """
-from fastapi import FastAPI, HTTPException, status, File, UploadFile, Form, Query, Body, Request, Response, Cookie
+from fastapi import FastAPI, HTTPException, status, File, UploadFile, Form, Query, Body, Request, Response, Cookie, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List, Dict, Any
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Optional, List, Dict, Any, Union
 from enum import Enum
-from decimal import Decimal
 from dotenv import load_dotenv
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 import os
-from jose import jwt, JWTError
+import re
+import threading
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from cachetools import TTLCache
+import base64
+import hashlib
+import hmac
+import jwt
+from jwt import PyJWTError as JWTError
 
 # Load environment variables from .env file before importing modules that reference them at import-time
 load_dotenv()
 
-from user_service import UserService
+if __name__ == "__main__":
+    # Hand off to the uvicorn CLI before anything is built: the app is then
+    # imported once as ``auth_api``, and process pools (PDF extraction) don't
+    # re-import this script as __mp_main__ and rebuild every service per child.
+    import sys
+    # uvloop + httptools are the Cython-based loop/protocol implementations;
+    # reload mode only supports a single worker, so workers apply when it is off.
+    reload = os.environ.get("UVICORN_RELOAD", "true").lower() == "true"
+    uvicorn_args = [
+        sys.executable, "-m", "uvicorn", "auth_api:app",
+        "--app-dir", os.path.dirname(os.path.abspath(__file__)),
+        "--host", "0.0.0.0",
+        "--port", "8000",
+        "--loop", "uvloop",
+        "--http", "httptools",
+    ]
+    if reload:
+        uvicorn_args.append("--reload")
+    else:
+        uvicorn_args += ["--workers", os.environ.get("WEB_CONCURRENCY", str(2 * (os.cpu_count() or 1) + 1))]
+    os.execv(sys.executable, uvicorn_args)
+
+from user_service import UserService, PUBLIC_USER_PROJECTION, INTERNAL_USER_FIELDS
 from org_service import OrgService
 from org_invitation_service import OrgInvitationService
-from s3_service import get_s3_service
+from s3_service import get_s3_service, S3_UPLOAD_PREFIX
 from ai_edit_api import router as ai_edit_router
-import os
 import asyncio
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 
 # Initialize FastAPI app
 app = FastAPI(
     title="EZ Common Auth API",
     description="User authentication service with AWS DynamoDB",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZip large responses, but leave incremental streams (SSE/NDJSON) untouched."""
+
+    excluded_paths = frozenset({
+        "/api/parse/file/stream",
+        "/api/parse/batch",
+        "/api/chatbot/message/stream",
+    })
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # CORS configuration
-CORS_ORIGINS = os.environ.get(
-    "CORS_ORIGINS",
-    "https://ezcollegeapp1.com"
-).split(",")
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "https://ezcollegeapp1.com").split(",")
+    if origin.strip()
+]
+
+# Match explicit origins with one anchored regex instead of a list scan; a
+# "*" entry keeps Starlette's own wildcard handling
+if "*" in CORS_ORIGINS:
+    CORS_ALLOW_ORIGINS = ["*"]
+    CORS_ORIGIN_REGEX = os.environ.get("CORS_ORIGIN_REGEX") or None
+else:
+    CORS_ALLOW_ORIGINS = []
+    CORS_ORIGIN_REGEX = os.environ.get("CORS_ORIGIN_REGEX") or "^(?:{})$".format(
+        "|".join(re.escape(origin) for origin in CORS_ORIGINS)
+    )
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=CORS_ORIGINS,
+    allow_origins=CORS_ALLOW_ORIGINS,
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -56,6 +121,11 @@ JWT_SECRET = os.environ.get("JWT_SECRET_KEY", os.environ.get("JWT_SECRET", "dev-
 JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+JWT_SECRET_BYTES = JWT_SECRET.encode()
+JWT_ALGS = [JWT_ALGORITHM]
+ACCESS_EXPIRES_IN = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+REFRESH_EXPIRES_IN = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+REFRESH_MAX_AGE = REFRESH_EXPIRES_IN
 REFRESH_COOKIE_SECURE = os.environ.get("REFRESH_COOKIE_SECURE", "false").lower() == "true"
 REFRESH_COOKIE_SAMESITE = os.environ.get("REFRESH_COOKIE_SAMESITE", "lax")
 
@@ -63,6 +133,21 @@ REFRESH_COOKIE_SAMESITE = os.environ.get("REFRESH_COOKIE_SAMESITE", "lax")
 org_service = OrgService()
 invitation_service = OrgInvitationService()
 
+# Org records rarely change; cache lookups (org endpoints run in the threadpool)
+_ORG_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_ORG_CACHE_LOCK = threading.Lock()
+
+
+def _get_org_cached(org_id: str) -> Optional[Dict[str, Any]]:
+    with _ORG_CACHE_LOCK:
+        org = _ORG_CACHE.get(org_id)
+    if org is None:
+        org = org_service.get_org_by_id(org_id)
+        if org:
+            with _ORG_CACHE_LOCK:
+                _ORG_CACHE[org_id] = org
+    return org
+
 # Initialize user service
 user_service = UserService()
 
@@ -77,19 +162,11 @@ def _build_search_config():
         'OPENSEARCH_REGION': os.environ.get('OPENSEARCH_REGION', 'us-east-1'),
         'OPENSEARCH_INDEX': os.environ.get('OPENSEARCH_INDEX', 'document_chunks'),
         'OPENSEARCH_PORT': int(os.environ.get('OPENSEARCH_PORT', '443')),
+        'OPENSEARCH_REFRESH_INTERVAL': os.environ.get('OPENSEARCH_REFRESH_INTERVAL', '1s'),
         'CHROMADB_DATA_DIR': os.environ.get('CHROMADB_DATA_DIR', './chroma_data'),
         'CHROMADB_COLLECTION_NAME': os.environ.get('CHROMADB_COLLECTION_NAME', 'document_chunks')
     }
 
-search_provider = None
-try:
-    search_config = _build_search_config()
-    search_provider = SearchProviderFactory.create(search_config)
-    print(f"✓ Search provider initialized: {search_config.get('SEARCH_PROVIDER', 'opensearch')}")
-except Exception as e:
-    print(f"⚠ Warning: Search provider initialization failed: {e}")
-    search_provider = None
-
 # Initialize LLM Provider (supports OpenAI, Gemini, Bedrock)
 from services.llm_providers import LLMProviderFactory
 
@@ -118,34 +195,25 @@ except Exception as e:
     llm_provider = None
 
 # Document Parsing Service
-from services.document_parse_service import DocumentParseService
+from services.document_parse_service import DocumentParseService, FILE_TYPES, PROCESSORS
 
-# Initialize parse service with search and LLM providers
-try:
-    parse_service = DocumentParseService(search_provider=search_provider, llm_provider=llm_provider)
-    print("✓ Document parse service initialized")
-except Exception as e:
-    print(f"⚠ Warning: Document parse service initialization failed: {e}")
-    parse_service = None
+# Dedicated pool for blocking parse work so parses don't starve the default
+# threadpool, plus a cap on concurrent parses hitting the LLM/search backends
+PARSE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("PARSE_WORKERS", "8")),
+    thread_name_prefix="parse",
+)
+PARSE_SEM = asyncio.Semaphore(int(os.environ.get("PARSE_CONCURRENCY", "8")))
+MAX_BATCH = int(os.environ.get("PARSE_MAX_BATCH", "50"))
 
 # Form Fill Service
 from services.form_fill_service import FormFillService
-from services.document_to_csv_service import DocumentToCSVService
+from services.document_to_csv_service import (
+    DocumentToCSVService,
+    SUMMARY_CSV_HEADER,
+    CATEGORIZED_CSV_HEADER,
+)
 from services.intelligent_extractor_service import IntelligentExtractorService
-from fastapi.responses import StreamingResponse
-from datetime import datetime, timedelta, timezone
-from requests import exceptions as requests_exceptions
-
-# Initialize form fill service
-try:
-    form_fill_service = FormFillService(
-        search_provider=search_provider,
-        llm_provider=llm_provider,
-    )
-    print("✓ Form fill service initialized")
-except Exception as e:
-    print(f"⚠ Warning: Form fill service initialization failed: {e}")
-    form_fill_service = None
 
 # Document CSV Service
 try:
@@ -155,15 +223,58 @@ except Exception as e:
     print(f"⚠ Warning: Document CSV service initialization failed: {e}")
     document_csv_service = None
 
-try:
-    intelligent_extractor_service = IntelligentExtractorService(
-        search_provider=search_provider,
-        llm_provider=llm_provider,
-    )
-    print("✓ Intelligent Extractor service initialized")
-except Exception as e:
-    print(f"⚠ Warning: Intelligent Extractor service initialization failed: {e}")
-    intelligent_extractor_service = None
+# Search-backed services are built per worker by _init_search_backends()
+# in the startup hook. The OpenSearch client keeps pooled TLS connections
+# and ChromaDB holds a SQLite handle, neither of which is safe to create in
+# the gunicorn master (preload_app) and inherit across fork.
+search_provider = None
+parse_service = None
+form_fill_service = None
+intelligent_extractor_service = None
+
+
+def _init_search_backends():
+    """Create the search provider and the services that hold it (once per worker)."""
+    global search_provider, parse_service, form_fill_service, intelligent_extractor_service
+
+    try:
+        search_config = _build_search_config()
+        search_provider = SearchProviderFactory.create(search_config)
+        search_provider.initialize()
+        print(f"✓ Search provider initialized: {search_config.get('SEARCH_PROVIDER', 'opensearch')}")
+    except Exception as e:
+        print(f"⚠ Warning: Search provider initialization failed: {e}")
+        search_provider = None
+
+    # Initialize parse service with search and LLM providers
+    try:
+        parse_service = DocumentParseService(search_provider=search_provider, llm_provider=llm_provider)
+        print("✓ Document parse service initialized")
+    except Exception as e:
+        print(f"⚠ Warning: Document parse service initialization failed: {e}")
+        parse_service = None
+
+    # Initialize form fill service
+    try:
+        form_fill_service = FormFillService(
+            search_provider=search_provider,
+            llm_provider=llm_provider,
+            cache_version_source=user_service.get_documents_version,
+        )
+        print("✓ Form fill service initialized")
+    except Exception as e:
+        print(f"⚠ Warning: Form fill service initialization failed: {e}")
+        form_fill_service = None
+
+    try:
+        intelligent_extractor_service = IntelligentExtractorService(
+            search_provider=search_provider,
+            llm_provider=llm_provider,
+        )
+        print("✓ Intelligent Extractor service initialized")
+    except Exception as e:
+        print(f"⚠ Warning: Intelligent Extractor service initialization failed: {e}")
+        intelligent_extractor_service = None
 
 
 
@@ -172,9 +283,60 @@ from voice_api import router as voice_router
 app.include_router(voice_router)
 
 
-def _require_user(user_id: str) -> Dict[str, Any]:
+def _invalidate_form_fill_cache(user_id: str):
+    """Drop cached form fill results once a user's documents change.
+
+    Clears this worker's entries and bumps the shared documents version so
+    every other worker treats its entries as stale too. Blocking (DynamoDB
+    write): call it from a worker thread.
+    """
+    if form_fill_service:
+        form_fill_service.cache.invalidate_user(user_id)
+        user_service.bump_documents_version(user_id)
+
+
+# Short-lived cache of user records, shared by all request paths
+_USER_CACHE: TTLCache = TTLCache(
+    maxsize=int(os.environ.get("USER_CACHE_SIZE", "20000")),
+    ttl=int(os.environ.get("USER_CACHE_TTL", "15")),
+)
+_USER_INFLIGHT: Dict[str, asyncio.Task] = {}
+
+
+async def _fetch_user(user_id: str) -> Optional[Dict[str, Any]]:
+    this_task = asyncio.current_task()
+    try:
+        user = await asyncio.to_thread(user_service.get_user_by_id, user_id)
+        # Skip caching if the user was invalidated while the read was in flight
+        if user and _USER_INFLIGHT.get(user_id) is this_task:
+            _USER_CACHE[user_id] = user
+        return user
+    finally:
+        if _USER_INFLIGHT.get(user_id) is this_task:
+            del _USER_INFLIGHT[user_id]
+
+
+async def _get_user_cached(user_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a user through the cache, coalescing concurrent misses into one GetItem."""
+    user = _USER_CACHE.get(user_id)
+    if user is not None:
+        return user
+
+    task = _USER_INFLIGHT.get(user_id)
+    if task is None:
+        task = asyncio.create_task(_fetch_user(user_id))
+        _USER_INFLIGHT[user_id] = task
+    return await asyncio.shield(task)
+
+
+def _invalidate_user_cache(user_id: str):
+    _USER_CACHE.pop(user_id, None)
+    _USER_INFLIGHT.pop(user_id, None)
+
+
+async def _require_user(user_id: str) -> Dict[str, Any]:
     """Fetch a user or raise if not found."""
-    user = user_service.get_user_by_id(user_id)
+    user = await _get_user_cached(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -188,11 +350,15 @@ def _require_user(user_id: str) -> Dict[str, Any]:
 
 # Form Fill Models
 class FieldDefinition(BaseModel):
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
     name: str
     category: str
     source: str
 
 class FormFillRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     field_definitions: List[FieldDefinition]
     section: Optional[str] = None
 
@@ -206,11 +372,29 @@ class FormFillResponse(BaseModel):
     results: Dict[str, str]
 
 
+def _chunks_to_columns(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert a list of chunk dicts into a columnar {"columns", "rows"} payload.
+
+    Keys are emitted once instead of once per chunk; a chunk missing a
+    column gets null in that position.
+    """
+    columns: Dict[str, None] = {}
+    for chunk in chunks:
+        for key in chunk:
+            columns.setdefault(key)
+    names = list(columns)
+    return {
+        "columns": names,
+        "rows": [[chunk.get(name) for name in names] for chunk in chunks],
+    }
+
+
 # Form Fill Endpoints
 @app.post("/api/form/fill", response_model=FormFillResponse, tags=["Form Filling"])
 async def fill_form_fields(
     request: FormFillRequest,
-    user_id: str = Query(..., description="User ID")
+    user_id: str = Query(..., description="User ID"),
+    bypass_cache: bool = Query(False, description="Skip cached results")
 ):
     """
     Fill multiple form fields using user's parsed documents
@@ -218,6 +402,7 @@ async def fill_form_fields(
     - **field_definitions**: List of fields to fill with name, category, and source
     - **user_id**: User ID to retrieve documents for
     - **section**: Optional section filter (education, activity, testing, profile)
+    - **bypass_cache**: Recompute instead of returning a cached result
     """
     if not form_fill_service:
         raise HTTPException(
@@ -225,23 +410,15 @@ async def fill_form_fields(
             detail="Form fill service not available"
         )
     
-    _require_user(user_id)
-
-    # Convert Pydantic models to dicts
-    field_defs = [
-        {
-            "name": field.name,
-            "category": field.category,
-            "source": field.source
-        }
-        for field in request.field_definitions
-    ]
+    await _require_user(user_id)
 
     try:
-        result = form_fill_service.fill_multiple_fields(
+        result = await asyncio.to_thread(
+            form_fill_service.fill_multiple_fields,
             user_id=user_id,
-            field_definitions=field_defs,
-            section=request.section
+            field_definitions=request.field_definitions,
+            section=request.section,
+            bypass_cache=bypass_cache
         )
     except Exception as exc:
         raise HTTPException(
@@ -261,13 +438,15 @@ async def fill_form_fields(
 @app.get("/api/form/chunks", tags=["Form Filling"])
 async def get_user_chunks_for_form(
     user_id: str = Query(..., description="User ID"),
-    section: Optional[str] = Query(None, description="Section filter")
+    section: Optional[str] = Query(None, description="Section filter"),
+    columnar: bool = Query(False, description="Return chunks as columns + rows")
 ):
     """
     Get all document chunks available for a user
 
     - **user_id**: User ID
     - **section**: Optional section filter
+    - **columnar**: Return chunks as {"columns": [...], "rows": [[...]]}
     """
     if not form_fill_service:
         raise HTTPException(
@@ -275,7 +454,7 @@ async def get_user_chunks_for_form(
             detail="Form fill service not available"
         )
     
-    _require_user(user_id)
+    await _require_user(user_id)
 
     chunks = form_fill_service.get_user_chunks(user_id, section)
 
@@ -283,7 +462,7 @@ async def get_user_chunks_for_form(
         "user_id": user_id,
         "section": section,
         "total_chunks": len(chunks),
-        "chunks": chunks
+        "chunks": _chunks_to_columns(chunks) if columnar else chunks
     }
 
 
@@ -295,7 +474,7 @@ class FileInfo(BaseModel):
     file_type: str
     size: int
     last_modified: str
-    url: str
+    url: Optional[str] = None
 
 
 class ParseFileRequest(BaseModel):
@@ -310,7 +489,7 @@ class ParseResultComplete(BaseModel):
     section: str
     file_type: str
     chunks_created: int
-    chunks: List[Dict[str, Any]]
+    chunks: Union[List[Dict[str, Any]], Dict[str, Any]]
     processor_used: str
     opensearch_stored: bool
 
@@ -322,9 +501,10 @@ class ParseResultComplete(BaseModel):
     response_model=List[FileInfo],
     tags=["Document Parsing"]
 )
-def list_user_files_endpoint(
+async def list_user_files_endpoint(
     user_id: str = Query(..., description="User ID"),
-    section: Optional[str] = Query(None, description="Filter by section")
+    section: Optional[str] = Query(None, description="Filter by section"),
+    include_urls: bool = Query(True, description="Presign a download URL for each file")
 ):
     """List all files uploaded by a user from S3"""
     if not parse_service:
@@ -334,8 +514,10 @@ def list_user_files_endpoint(
         )
 
     try:
-        files = parse_service.list_user_files(user_id, section)
-        return files
+        files = await asyncio.to_thread(parse_service.list_user_files, user_id, section, include_urls)
+        # The service already returns FileInfo-shaped dicts; encode them
+        # directly instead of validating each one against the response model
+        return ORJSONResponse(files)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -348,6 +530,7 @@ def list_user_files_endpoint(
     tags=["Document Parsing"]
 )
 async def parse_file_stream_endpoint(
+    request: Request,
     s3_key: str = Query(..., description="S3 key of the file to parse"),
     user_id: str = Query(..., description="User ID")
 ):
@@ -366,48 +549,70 @@ async def parse_file_stream_endpoint(
 
     async def event_generator():
         """Generate SSE events for progress updates"""
-        progress_queue = asyncio.Queue()
+        progress_queue = asyncio.Queue(maxsize=64)
         result_container = {}
         error_container = {}
+        loop = asyncio.get_running_loop()
+
+        def put_latest(update):
+            """Enqueue an update, dropping the oldest one if the client is slow"""
+            try:
+                progress_queue.put_nowait(update)
+            except asyncio.QueueFull:
+                progress_queue.get_nowait()
+                progress_queue.put_nowait(update)
 
         def progress_callback(progress: int, message: str):
-            """Callback to receive progress updates from sync code"""
-            asyncio.create_task(progress_queue.put({
+            """Callback to receive progress updates from sync code.
+
+            Runs on the parse worker thread, so hand the update back to the
+            event loop instead of touching the queue directly.
+            """
+            loop.call_soon_threadsafe(put_latest, {
                 "progress": progress,
                 "message": message
-            }))
+            })
+
+        def run_parse():
+            # Invalidate from the worker so it still happens if the client
+            # disconnects and the awaiting task is cancelled
+            result = parse_service.process_file_from_s3(s3_key, user_id, progress_callback)
+            _invalidate_form_fill_cache(user_id)
+            return result
 
         async def process_file():
             """Run the file processing in a thread pool"""
             try:
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(
-                    None,
-                    lambda: parse_service.process_file_from_s3(
-                        s3_key, user_id, progress_callback
-                    )
-                )
+                async with PARSE_SEM:
+                    result = await loop.run_in_executor(PARSE_POOL, run_parse)
                 result_container['result'] = result
-                await progress_queue.put(None)  # Signal completion
+                put_latest(None)  # Signal completion
             except Exception as e:
                 error_container['error'] = str(e)
-                await progress_queue.put(None)  # Signal completion
+                put_latest(None)  # Signal completion
 
         # Start processing in background
-        asyncio.create_task(process_file())
+        task = asyncio.create_task(process_file())
 
         # Stream progress updates
-        while True:
-            update = await progress_queue.get()
-
-            if update is None:  # Processing complete
-                if 'error' in error_container:
-                    yield f"data: {json.dumps({'error': error_container['error']})}\n\n"
-                elif 'result' in result_container:
-                    yield f"data: {json.dumps({'progress': 100, 'message': 'Complete!', 'result': result_container['result']})}\n\n"
-                break
-            else:
-                yield f"data: {json.dumps(update)}\n\n"
+        try:
+            while True:
+                update = await progress_queue.get()
+
+                if await request.is_disconnected():
+                    break
+
+                if update is None:  # Processing complete
+                    if 'error' in error_container:
+                        yield b"data: " + orjson.dumps({'error': error_container['error']}) + b"\n\n"
+                    elif 'result' in result_container:
+                        yield b"data: " + orjson.dumps({'progress': 100, 'message': 'Complete!', 'result': result_container['result']}) + b"\n\n"
+                    break
+                else:
+                    yield b"data: " + orjson.dumps(update) + b"\n\n"
+        finally:
+            # Client went away (or we finished): stop waiting on the parse
+            task.cancel()
 
     return StreamingResponse(
         event_generator(),
@@ -427,7 +632,8 @@ async def parse_file_stream_endpoint(
 )
 async def parse_file_from_s3_endpoint(
     body: ParseFileRequest,
-    user_id: str = Query(...)
+    user_id: str = Query(...),
+    columnar: bool = Query(False, description="Return chunks as columns + rows")
 ):
     """
     Parse a file from S3 with complete processing (non-streaming version)
@@ -446,7 +652,11 @@ async def parse_file_from_s3_endpoint(
         )
 
     try:
-        result = parse_service.process_file_from_s3(body.s3_key, user_id)
+        # S3 download + PDF/vision processing take seconds; keep them off the event loop
+        result = await parse_service.aprocess_file_from_s3(body.s3_key, user_id)
+        await asyncio.to_thread(_invalidate_form_fill_cache, user_id)
+        if columnar:
+            result = {**result, "chunks": _chunks_to_columns(result.get("chunks", []))}
         return result
     except ValueError as e:
         raise HTTPException(
@@ -468,41 +678,72 @@ async def parse_batch_files_endpoint(
     s3_keys: List[str] = Body(...),
     user_id: str = Query(...)
 ):
-    """Parse multiple files in batch"""
+    """
+    Parse multiple files in batch
+
+    Streams newline-delimited JSON: one parse result per line in completion
+    order, followed by a final line with "summary": true and the totals.
+    """
     if not parse_service:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Parse service not available"
         )
 
-    results = []
-    for s3_key in s3_keys:
+    if len(s3_keys) > MAX_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many files in batch (max {MAX_BATCH})"
+        )
+
+    async def parse_one(s3_key: str) -> Dict[str, Any]:
         try:
-            result = parse_service.process_file_from_s3(s3_key, user_id)
-            results.append(result)
+            async with PARSE_SEM:
+                return await parse_service.aprocess_file_from_s3(
+                    s3_key, user_id, executor=PARSE_POOL
+                )
         except Exception as e:
-            results.append({
+            return {
                 "status": "error",
                 "s3_key": s3_key,
                 "error": str(e)
-            })
-
-    successful = len([r for r in results if r.get('status') == 'success'])
-    failed = len([r for r in results if r.get('status') == 'error'])
-    total_chunks = sum([r.get('chunks_created', 0) for r in results if r.get('status') == 'success'])
+            }
 
-    return {
-        "total_files": len(s3_keys),
-        "successful": successful,
-        "failed": failed,
-        "total_chunks": total_chunks,
-        "results": results
-    }
+    async def result_lines():
+        """Yield one NDJSON line per parsed file as it finishes, then a summary line"""
+        successful = failed = total_chunks = 0
+        tasks = [asyncio.create_task(parse_one(s3_key)) for s3_key in s3_keys]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result.get('status') == 'success':
+                    successful += 1
+                    total_chunks += result.get('chunks_created', 0)
+                elif result.get('status') == 'error':
+                    failed += 1
+                yield orjson.dumps(result) + b"\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Not awaited: this also runs when the client disconnects
+            asyncio.get_running_loop().run_in_executor(None, _invalidate_form_fill_cache, user_id)
+
+        yield orjson.dumps({
+            "summary": True,
+            "total_files": len(s3_keys),
+            "successful": successful,
+            "failed": failed,
+            "total_chunks": total_chunks,
+        }) + b"\n"
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
 
 
 
 # Pydantic models
 class RegisterRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     first_name: str = Field(..., min_length=1, max_length=100)
     last_name: str = Field(..., min_length=1, max_length=100)
     email: EmailStr
@@ -520,6 +761,8 @@ class RegisterRequest(BaseModel):
 
 
 class LoginRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     email: EmailStr
     password: str
     login_type: Optional[str] = Field(None, description="student or org for front-end gating")
@@ -588,6 +831,41 @@ class OrgInvitationCreateRequest(BaseModel):
     )
 
 
+# Upper bound on students per bulk invitation request
+MAX_BULK_INVITATIONS = int(os.environ.get("MAX_BULK_INVITATIONS", "500"))
+
+
+class StudentRef(BaseModel):
+    """A student to invite, by email or user ID."""
+
+    student_email: Optional[EmailStr] = None
+    student_id: Optional[str] = None
+
+
+class OrgInvitationBulkCreateRequest(BaseModel):
+    """Payload for organization inviting many students at once."""
+
+    org_id: str = Field(..., description="Organization ID (from org user's account)")
+    students: List[StudentRef] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BULK_INVITATIONS,
+        description="Students to invite, each by email or student_id",
+    )
+    message: Optional[str] = Field(
+        None,
+        description="Optional message to include with every invitation",
+    )
+    org_name: Optional[str] = Field(
+        None,
+        description="Optional organization display name to show to the students",
+    )
+    created_by_user_id: Optional[str] = Field(
+        None,
+        description="ID of the org user that created the invitations",
+    )
+
+
 class InvitationActionRequest(BaseModel):
     """Payload for a student accepting / rejecting an invitation."""
 
@@ -596,11 +874,16 @@ class InvitationActionRequest(BaseModel):
 
 
 
+# Static response bodies, serialized once
+HEALTH_BYTES = orjson.dumps({"ok": True, "service": "auth-api", "status": "healthy"})
+USER_DELETED_BYTES = orjson.dumps({"message": "User deleted successfully"})
+
+
 # Health check endpoint
 @app.get("/healthz")
 def health_check():
     """Health check endpoint"""
-    return {"ok": True, "service": "auth-api", "status": "healthy"}
+    return Response(content=HEALTH_BYTES, media_type="application/json")
 
 
 # Authentication endpoints
@@ -610,7 +893,7 @@ def health_check():
     status_code=status.HTTP_201_CREATED,
     tags=["Authentication"]
 )
-def register(body: RegisterRequest):
+async def register(body: RegisterRequest):
     """
     Register a new user
 
@@ -632,7 +915,8 @@ def register(body: RegisterRequest):
         org_id = f"org_{uuid4().hex}"
 
     # Create user with role and org_id
-    user = user_service.create_user(
+    user = await asyncio.to_thread(
+        user_service.create_user,
         email=body.email,
         first_name=body.first_name,
         last_name=body.last_name,
@@ -651,7 +935,8 @@ def register(body: RegisterRequest):
     if requested_role == "org_admin" and org_id is not None:
         org_name = (body.org_name or f"{body.first_name} {body.last_name} Org").strip()
         try:
-            org_service.create_org(
+            await asyncio.to_thread(
+                org_service.create_org,
                 org_id=org_id,
                 name=org_name,
                 owner_user_id=user["id"],
@@ -664,11 +949,25 @@ def register(body: RegisterRequest):
     return user
 
 
-def _create_token(payload: Dict[str, Any], expires_delta: timedelta) -> str:
-    to_encode = payload.copy()
-    now = datetime.now(timezone.utc)
-    to_encode.update({"iat": now, "exp": now + expires_delta})
-    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+_HS256_HEADER = _b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+
+def _create_token(claims: Dict[str, Any], expires_in: int) -> str:
+    """Sign ``claims`` (a fresh dict owned by the caller; iat/exp are added in place)."""
+    now = int(time.time())
+    claims["iat"] = now
+    claims["exp"] = now + expires_in
+    if JWT_ALGORITHM != "HS256":
+        return jwt.encode(claims, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+    # HS256 fast path: orjson + hashlib's OpenSSL-backed HMAC-SHA256
+    signing_input = _HS256_HEADER + b"." + _b64url(orjson.dumps(claims))
+    signature = hmac.new(JWT_SECRET_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url(signature)).decode()
 
 
 def _create_access_token(user: Dict[str, Any]) -> str:
@@ -679,7 +978,7 @@ def _create_access_token(user: Dict[str, Any]) -> str:
             "role": user.get("role", "student"),
             "org_id": user.get("org_id"),
         },
-        timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        ACCESS_EXPIRES_IN,
     )
 
 
@@ -689,12 +988,23 @@ def _create_refresh_token(user: Dict[str, Any]) -> str:
             "sub": user["id"],
             "type": "refresh",
         },
-        timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        REFRESH_EXPIRES_IN,
     )
 
 
 def _decode_token(token: str) -> Dict[str, Any]:
-    return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    return jwt.decode(token, JWT_SECRET, algorithms=JWT_ALGS)
+
+
+@lru_cache(maxsize=4096)
+def _decode_token_cached(token: str) -> Dict[str, Any]:
+    """Verify a token once and memoize its payload.
+
+    Failed verifications raise and are never cached; callers must re-check
+    ``exp`` since a cached payload outlives the signature check. The
+    returned dict is shared, so treat it as read-only.
+    """
+    return _decode_token(token)
 
 
 def _set_refresh_cookie(response: Response, token: str):
@@ -704,21 +1014,26 @@ def _set_refresh_cookie(response: Response, token: str):
         httponly=True,
         secure=REFRESH_COOKIE_SECURE,
         samesite=REFRESH_COOKIE_SAMESITE,
-        max_age=REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
+        max_age=REFRESH_MAX_AGE,
         path="/",
     )
 
 
+_TOKEN_RESPONSE_BASE = MappingProxyType({
+    "token_type": "bearer",
+    "expires_in": ACCESS_EXPIRES_IN,
+    "refresh_expires_in": REFRESH_EXPIRES_IN,
+})
+
+
 def _build_token_response(user: Dict[str, Any], response: Response) -> Dict[str, Any]:
     access = _create_access_token(user)
     refresh = _create_refresh_token(user)
     _set_refresh_cookie(response, refresh)
     return {
+        **_TOKEN_RESPONSE_BASE,
         "access_token": access,
         "refresh_token": refresh,
-        "token_type": "bearer",
-        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        "refresh_expires_in": REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
         "user": user,
     }
 
@@ -728,14 +1043,14 @@ def _build_token_response(user: Dict[str, Any], response: Response) -> Dict[str,
     response_model=TokenResponse,
     tags=["Authentication"]
 )
-def login(body: LoginRequest, response: Response):
+async def login(body: LoginRequest, response: Response):
     """
     Login with email and password
 
     - **email**: User's email
     - **password**: User's password
     """
-    user = user_service.authenticate_user(body.email, body.password)
+    user = await asyncio.to_thread(user_service.authenticate_user, body.email, body.password)
 
     if not user:
         raise HTTPException(
@@ -751,13 +1066,13 @@ def login(body: LoginRequest, response: Response):
     response_model=UserResponse,
     tags=["User Management"]
 )
-def get_user(user_id: str):
+async def get_user(user_id: str):
     """
     Get user by ID
 
     - **user_id**: User's unique ID
     """
-    user = user_service.get_user_by_id(user_id)
+    user = await _get_user_cached(user_id)
 
     if not user:
         raise HTTPException(
@@ -765,10 +1080,8 @@ def get_user(user_id: str):
             detail="User not found"
         )
 
-    # Remove password_hash from response
-    user_copy = dict(user)
-    user_copy.pop('password_hash', None)
-    return user_copy
+    # Remove password_hash and internal index fields from response
+    return {k: v for k, v in user.items() if k not in INTERNAL_USER_FIELDS}
 
 
 @app.post(
@@ -776,7 +1089,7 @@ def get_user(user_id: str):
     response_model=TokenResponse,
     tags=["Authentication"]
 )
-def refresh_token(
+async def refresh_token(
     response: Response,
     body: RefreshRequest = Body(None),
     refresh_cookie: Optional[str] = Cookie(None, alias="refresh_token"),
@@ -790,14 +1103,16 @@ def refresh_token(
         )
 
     try:
-        payload = _decode_token(token)
+        payload = _decode_token_cached(token)
+        if payload.get("exp", 0) <= time.time():
+            raise JWTError("Signature has expired.")
         if payload.get("type") != "refresh":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token",
             )
         user_id = payload.get("sub")
-        user = user_service.get_user_by_id(user_id)
+        user = await _get_user_cached(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -816,7 +1131,7 @@ def refresh_token(
     response_model=UserResponse,
     tags=["User Management"]
 )
-def update_user(user_id: str, body: UpdateUserRequest):
+async def update_user(user_id: str, body: UpdateUserRequest):
     """
     Update user information
 
@@ -825,7 +1140,8 @@ def update_user(user_id: str, body: UpdateUserRequest):
     - **last_name**: New last name (optional)
     - **password**: New password (optional)
     """
-    user = user_service.update_user(
+    user = await asyncio.to_thread(
+        user_service.update_user,
         user_id=user_id,
         first_name=body.first_name,
         last_name=body.last_name,
@@ -838,6 +1154,7 @@ def update_user(user_id: str, body: UpdateUserRequest):
             detail="User not found"
         )
 
+    _invalidate_user_cache(user_id)
     return user
 
 
@@ -846,12 +1163,15 @@ def update_user(user_id: str, body: UpdateUserRequest):
     response_model=MessageResponse,
     tags=["User Management"],
 )
-def delete_user(user_id: str):
+async def delete_user(user_id: str):
     """Delete a user.
 
     - **user_id**: User's unique ID
     """
-    success = user_service.delete_user(user_id)
+    success = await asyncio.to_thread(user_service.delete_user, user_id)
+    _invalidate_user_cache(user_id)
+    if parse_service:
+        parse_service.forget_parsed(user_id)
 
     if not success:
         raise HTTPException(
@@ -859,7 +1179,7 @@ def delete_user(user_id: str):
             detail="User not found or deletion failed",
         )
     
-    return {"message": "User deleted successfully"}
+    return Response(content=USER_DELETED_BYTES, media_type="application/json")
 
 
 # ============================================================================
@@ -897,7 +1217,7 @@ def create_org_invitation(body: OrgInvitationCreateRequest):
     # Try to infer org_name from org table if not provided
     org_name = body.org_name
     if org_name is None:
-        org = org_service.get_org_by_id(body.org_id)
+        org = _get_org_cached(body.org_id)
         if org:
             org_name = org.get("name")
 
@@ -911,6 +1231,57 @@ def create_org_invitation(body: OrgInvitationCreateRequest):
     return item
 
 
+@app.post("/api/org/invitations/bulk", tags=["Organization"])
+def bulk_create_org_invitations(body: OrgInvitationBulkCreateRequest):
+    """Organization sends invitations to many students in one request.
+
+    Students given by ID are resolved with one BatchGetItem, students given by
+    email with parallel email-index lookups, and the invitations are written
+    with BatchWriteItem. Returns a status per requested student, in order.
+    """
+
+    ids = [ref.student_id for ref in body.students if ref.student_id]
+    emails = [ref.student_email for ref in body.students if not ref.student_id and ref.student_email]
+    users_by_id = user_service.get_users_by_ids(ids, projection=PUBLIC_USER_PROJECTION)
+    users_by_email = user_service.get_users_by_emails(emails, projection=PUBLIC_USER_PROJECTION)
+
+    results = []
+    student_ids = []
+    for ref in body.students:
+        if ref.student_id:
+            student = users_by_id.get(ref.student_id)
+        elif ref.student_email:
+            student = users_by_email.get(ref.student_email.lower().strip())
+        else:
+            results.append({"student_id": None, "student_email": None, "status": "invalid"})
+            continue
+
+        if not student or student.get("role", "student") != "student":
+            results.append({"student_id": ref.student_id, "student_email": ref.student_email, "status": "not_found"})
+            continue
+
+        student_ids.append(student["id"])
+        results.append({"student_id": student["id"], "student_email": student.get("email"), "status": "invited"})
+
+    org_name = body.org_name
+    if org_name is None and student_ids:
+        org = _get_org_cached(body.org_id)
+        if org:
+            org_name = org.get("name")
+
+    if student_ids:
+        invitation_service.bulk_create_invitations(
+            org_id=body.org_id,
+            student_ids=student_ids,
+            org_name=org_name,
+            created_by_user_id=body.created_by_user_id,
+            message=body.message,
+        )
+
+    invited = sum(1 for row in results if row["status"] == "invited")
+    return {"results": results, "invited": invited, "count": len(results)}
+
+
 @app.get("/api/org/invitations", tags=["Organization"])
 def list_org_invitations(org_id: str):
     """List all invitations created by an organization."""
@@ -965,25 +1336,27 @@ def reject_invitation(body: InvitationActionRequest):
 def list_org_students(org_id: str):
     """List students that have accepted invitations for this organization."""
 
-    relationships = invitation_service.get_accepted_students_for_org(org_id)
-    students = []
-    for rel in relationships:
-        student = user_service.get_user_by_id(rel.get("student_id"))
-        if not student:
-            continue
-        # Remove password_hash before returning
-        student_copy = dict(student)
-        student_copy.pop("password_hash", None)
-        students.append(student_copy)
+    student_ids = list(invitation_service.iter_accepted_student_ids(org_id))
+    # Projected reads never fetch password_hash or internal fields, so items
+    # are returned as-is
+    users_by_id = user_service.get_users_by_ids(student_ids, projection=PUBLIC_USER_PROJECTION)
+    students = [users_by_id[sid] for sid in student_ids if sid in users_by_id]
 
     return {"students": students, "count": len(students)}
 
 
+# User IDs are uuid4 strings; anything shaped like one is looked up by id only
+_USER_ID_QUERY_RE = re.compile(r"[0-9a-f-]{20,}")
+
+
 @app.get("/api/org/students/search", tags=["Organization"])
-def search_students_for_org(query: str, limit: int = 20):
+def search_students_for_org(query: str, limit: int = 20, contains: bool = False):
     """Search potential student accounts by email, id, or name.
 
     This is intended to help org users find the correct student to invite.
+    Names and emails are matched by prefix; pass ``contains=true`` to also
+    match anywhere in them (e.g. "son" -> "Johnson"), which scans the users
+    table and is much slower.
     """
 
     q = (query or "").strip().lower()
@@ -992,31 +1365,35 @@ def search_students_for_org(query: str, limit: int = 20):
 
     # 1) Try exact email match
     if "@" in q:
-        student = user_service.get_user_by_email(q)
+        student = user_service.get_user_by_email(q, projection=PUBLIC_USER_PROJECTION)
+        if student and student.get("role", "student") == "student":
+            return {"users": [student], "count": 1}
+    # 2) Try exact id match (an id-shaped query never matches a name or email)
+    elif _USER_ID_QUERY_RE.fullmatch(q):
+        student = user_service.get_user_by_id(query.strip(), projection=PUBLIC_USER_PROJECTION)
         if student and student.get("role", "student") == "student":
-            student_copy = dict(student)
-            student_copy.pop("password_hash", None)
-            return {"users": [student_copy], "count": 1}
-
-    # 2) Try exact id match
-    student = user_service.get_user_by_id(query)
-    if student and student.get("role", "student") == "student":
-        student_copy = dict(student)
-        student_copy.pop("password_hash", None)
-        return {"users": [student_copy], "count": 1}
-
-    # 3) Fallback: scan a limited set of users and match by name / email contains
-    candidates = user_service.list_users(limit=500)
+            return {"users": [student], "count": 1}
+        return {"users": [], "count": 0}
+
+    # 3) Fallback: prefix match on email and full name via the role GSIs
     results = []
-    for user in candidates:
-        if user.get("role", "student") != "student":
+    seen = set()
+    for user in (
+        user_service.search_by_email_prefix(q, limit)
+        + user_service.search_by_name_prefix(q, limit)
+    ):
+        if user["id"] in seen:
             continue
-        full_name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip().lower()
-        email = str(user.get("email", "")).lower()
-        if q in full_name or q in email:
-            results.append(user)
-            if len(results) >= limit:
-                break
+        seen.add(user["id"])
+        results.append(user)
+        if len(results) >= limit:
+            break
+
+    # 4) Opt-in: top up with substring matches after the prefix hits
+    if contains and len(results) < limit:
+        results.extend(user_service.search_students_containing(
+            q, limit=limit - len(results), exclude_ids=seen
+        ))
 
     return {"users": results, "count": len(results)}
 
@@ -1049,11 +1426,40 @@ class Section(str, Enum):
     testing = "testing"
 
 
+def _warm_up_backends():
+    """Open connections to DynamoDB and the search backend before serving.
+
+    Runs once per worker after fork, once _init_search_backends() has built
+    that worker's own search provider, so every worker starts with primed
+    connection pools instead of paying TLS setup on the first request.
+    """
+    try:
+        user_service.table.load()
+        print("✓ DynamoDB connection warmed up")
+    except Exception as e:
+        print(f"⚠ Warning: DynamoDB warmup failed: {e}")
+
+    if search_provider:
+        if search_provider.is_available():
+            print("✓ Search provider connection warmed up")
+        else:
+            print("⚠ Warning: Search provider warmup failed")
+
+
+# Cap concurrent S3 uploads per worker
+UPLOAD_SEM = asyncio.Semaphore(int(os.environ.get("UPLOAD_CONCURRENCY", "4")))
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize S3 bucket on startup"""
+    """Build this worker's search backends, check the S3 bucket and warm up connections"""
+    await asyncio.to_thread(_init_search_backends)
     s3_service = get_s3_service()
-    if not s3_service.ensure_bucket_exists():
+    bucket_ready, _ = await asyncio.gather(
+        asyncio.to_thread(s3_service.ensure_bucket_exists),
+        asyncio.to_thread(_warm_up_backends),
+    )
+    if not bucket_ready:
         print("Warning: S3 bucket initialization failed")
 
 
@@ -1084,38 +1490,42 @@ async def upload_files(
     uploaded_files = []
     errors = []
 
-    for file in files:
-        try:
-            # Read file content
-            content = await file.read()
-
-            # Upload to S3
-            result = s3_service.upload_file(
-                file_content=content,
+    async def upload_one(file: UploadFile) -> Dict[str, Any]:
+        # Stream the spooled upload straight to S3 instead of reading it into memory
+        async with UPLOAD_SEM:
+            return await asyncio.to_thread(
+                s3_service.upload_file,
+                file_content=file.file,
                 filename=file.filename or "unnamed",
                 user_id=user_id,
                 section=section.value,
                 content_type=file.content_type
             )
 
-            if result['success']:
-                uploaded_files.append({
-                    'filename': result['filename'],
-                    'unique_filename': result['unique_filename'],
-                    's3_key': result['s3_key'],
-                    'url': result['url'],
-                    'size': result['size'],
-                    'section': result['section']
-                })
-            else:
-                errors.append({
-                    'filename': result['filename'],
-                    'error': result.get('error', 'Upload failed')
-                })
-        except Exception as e:
+    outcomes = await asyncio.gather(
+        *[upload_one(file) for file in files],
+        return_exceptions=True,
+    )
+
+    for file, result in zip(files, outcomes):
+        if isinstance(result, Exception):
             errors.append({
                 'filename': file.filename or "unknown",
-                'error': str(e)
+                'error': str(result)
+            })
+        elif result['success']:
+            uploaded_files.append({
+                'filename': result['filename'],
+                'unique_filename': result['unique_filename'],
+                's3_key': result['s3_key'],
+                'url': result['url'],
+                'size': result['size'],
+                'section': result['section']
+            })
+        else:
+            errors.append({
+                'filename': result['filename'],
+                'error': result.get('error', 'Upload failed')
             })
 
     return {
@@ -1145,7 +1555,9 @@ async def list_files(
         raise HTTPException(status_code=400, detail="user_id is required")
 
     s3_service = get_s3_service()
-    files = s3_service.list_user_files(user_id=user_id, section=section.value)
+    files = await asyncio.to_thread(
+        s3_service.list_user_files, user_id=user_id, section=section.value
+    )
 
     return {
         "ok": True,
@@ -1153,30 +1565,39 @@ async def list_files(
     }
 
 
+def verify_owns_key(
+    s3_key: str = Query(..., description="S3 object key"),
+    user_id: str = Query(..., description="User ID for authorization")
+) -> str:
+    """Dependency that returns ``s3_key`` only if it lives under the user's upload prefix."""
+    if not s3_key or not user_id:
+        raise HTTPException(status_code=400, detail="s3_key and user_id are required")
+
+    if not s3_key.startswith(f"{S3_UPLOAD_PREFIX}/{user_id}/"):
+        raise HTTPException(status_code=403, detail="Unauthorized to access this file")
+    return s3_key
+
+
 @app.delete("/api/upload/file")
 async def delete_file(
-    s3_key: str = Query(..., description="S3 key of file to delete"),
+    s3_key: str = Depends(verify_owns_key),
     user_id: str = Query(..., description="User ID for authorization")
 ):
     """
     Delete a file from S3
 
     Args:
-        s3_key: S3 object key
-        user_id: User ID (for authorization check)
+        s3_key: S3 object key (query param, checked against user_id)
+        user_id: User ID (query param, for authorization check)
 
     Returns:
         Deletion result
     """
-    if not s3_key or not user_id:
-        raise HTTPException(status_code=400, detail="s3_key and user_id are required")
-
-    # Verify the file belongs to the user
-    if not s3_key.startswith(f"user-uploads/{user_id}/"):
-        raise HTTPException(status_code=403, detail="Unauthorized to delete this file")
-
     s3_service = get_s3_service()
-    success = s3_service.delete_file(s3_key)
+    success = await asyncio.to_thread(s3_service.delete_file, s3_key)
+    if parse_service:
+        parse_service.forget_parsed(user_id, s3_key)
+    await asyncio.to_thread(_invalidate_form_fill_cache, user_id)
 
     if success:
         return {
@@ -1199,7 +1620,7 @@ async def list_all_user_files(user_id: str):
         List of all user files
     """
     s3_service = get_s3_service()
-    files = s3_service.list_user_files(user_id=user_id)
+    files = await asyncio.to_thread(s3_service.list_user_files, user_id=user_id)
 
     return {
         "ok": True,
@@ -1219,7 +1640,7 @@ async def get_user_info(user_id: str):
     Returns:
         User information (without password)
     """
-    user = user_service.get_user_by_id(user_id)
+    user = await _get_user_cached(user_id)
 
     if not user:
         raise HTTPException(
@@ -1227,8 +1648,8 @@ async def get_user_info(user_id: str):
             detail="User not found"
         )
 
-    # Remove password_hash from response
-    user_data = {k: v for k, v in user.items() if k != 'password_hash'}
+    # Remove password_hash and internal index fields from response
+    user_data = {k: v for k, v in user.items() if k not in INTERNAL_USER_FIELDS}
 
     return {
         "ok": True,
@@ -1275,34 +1696,38 @@ async def export_detailed_csv(
             detail="Document CSV service not available"
         )
     try:
-        result = document_csv_service.generate_summary_csv(user_id, section)
-
-        if result['status'] == 'error':
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=result['message']
-            )
-
-        section_name = section or 'all'
-        filename = f"documents_{section_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-
-        return StreamingResponse(
-            iter([result['csv_content']]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "X-Total-Documents": str(result['total_documents']),
-                "X-Total-Chunks": str(result['total_chunks'])
-            }
+        documents = await asyncio.to_thread(
+            document_csv_service.get_user_documents, user_id, section
         )
-    except HTTPException:
-        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to export CSV: {str(e)}"
         )
 
+    if not documents:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No documents found for this user"
+        )
+
+    section_name = section or 'all'
+    filename = f"documents_{section_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    total_chunks = sum(len(doc.get('information_chunks', [])) for doc in documents)
+
+    # Rows are encoded and flushed in batches as the response is sent
+    return StreamingResponse(
+        document_csv_service.iter_csv(
+            SUMMARY_CSV_HEADER, document_csv_service.iter_summary_rows(documents)
+        ),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Total-Documents": str(len(documents)),
+            "X-Total-Chunks": str(total_chunks)
+        }
+    )
+
 
 @app.get("/api/documents/export/categorized", tags=["Document CSV"])
 async def export_categorized_csv(
@@ -1316,41 +1741,39 @@ async def export_categorized_csv(
             detail="Document CSV service not available"
         )
     try:
-        result = document_csv_service.generate_categorized_csv(user_id, section)
-
-        if result['status'] == 'error':
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=result['message']
-            )
-
-        section_name = section or 'all'
-        filename = f"documents_categorized_{section_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-
-        return StreamingResponse(
-            iter([result['csv_content']]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "X-Total-Documents": str(result['total_documents']),
-                "X-Total-Categories": str(result['total_categories'])
-            }
+        documents = await asyncio.to_thread(
+            document_csv_service.get_user_documents, user_id, section
         )
-    except HTTPException:
-        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to export CSV: {str(e)}"
         )
 
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "auth_api:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
+    if not documents:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No documents found for this user"
+        )
+
+    section_name = section or 'all'
+    filename = f"documents_categorized_{section_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    total_categories = len({
+        chunk.get('category', 'uncategorized')
+        for doc in documents
+        for chunk in doc.get('information_chunks', [])
+    })
+
+    return StreamingResponse(
+        document_csv_service.iter_csv(
+            CATEGORIZED_CSV_HEADER, document_csv_service.iter_categorized_rows(documents)
+        ),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Total-Documents": str(len(documents)),
+            "X-Total-Categories": str(total_categories)
+        }
     )
 
 # Document Parsing Models
@@ -1378,8 +1801,6 @@ async def parse_document(
     - **file**: Document file (PDF or image)
     - **user_id**: User ID for tracking
     """
-    import tempfile
-    import time
     from pathlib import Path
 
     if not file.filename:
@@ -1391,49 +1812,34 @@ async def parse_document(
     # Determine file type
     file_ext = Path(file.filename).suffix.lower()
 
-    if file_ext == '.pdf':
-        file_type = 'pdf'
-        processor = 'PyPDF2Processor'
-    elif file_ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-        file_type = 'image'
-        processor = 'BedrockVisionProcessor'
-    else:
+    # Same extension and processor tables as the S3 parse service
+    try:
+        file_type = FILE_TYPES[file_ext]
+        processor = PROCESSORS[file_type]
+    except KeyError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported file type: {file_ext}"
         )
 
-    # Save file temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_path = tmp_file.name
+    # The upload is already spooled by Starlette; only its size is needed,
+    # so measure it in place instead of reading it into memory
+    file.file.seek(0, os.SEEK_END)
+    file_size_kb = file.file.tell() / 1024
 
-    try:
-        # Simulate processing time
-        time.sleep(0.5)
-
-        # Simulate chunk creation based on file size
-        file_size_kb = len(content) / 1024
-        chunks_created = max(1, int(file_size_kb / 10))  # 1 chunk per 10KB
-
-        # Generate document ID
-        document_id = f"doc_{user_id}_{int(time.time())}"
-
-        return ParseResult(
-            document_id=document_id,
-            source_file=file.filename,
-            file_type=file_type,
-            chunks_created=chunks_created,
-            processor_used=processor
-        )
+    # Simulate chunk creation based on file size
+    chunks_created = max(1, int(file_size_kb / 10))  # 1 chunk per 10KB
 
-    finally:
-        # Clean up temporary file
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
+    # Generate document ID
+    document_id = f"doc_{user_id}_{uuid4().hex}"
+
+    return ParseResult(
+        document_id=document_id,
+        source_file=file.filename,
+        file_type=file_type,
+        chunks_created=chunks_created,
+        processor_used=processor
+    )
 
 
 
@@ -1536,8 +1942,53 @@ async def chatbot_message(request: ChatbotRequest):
     """
     try:
         chatbot_service = get_chatbot_service()
-        response = chatbot_service.get_response(request.message, request.history)
+        response = await chatbot_service.get_response(request.message, request.history)
         return ChatbotResponse(response=response)
     except Exception as e:
         print(f"Error in chatbot endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/chatbot/message/stream")
+async def chatbot_message_stream(request: ChatbotRequest, http_request: Request):
+    """
+    Send a message to the chatbot and stream the response via Server-Sent Events (SSE)
+
+    Returns a stream in the format:
+    data: {"delta": "Hello"}
+    data: {"delta": " there!"}
+    data: {"done": true}
+
+    POST body is the same as /api/chatbot/message, so read it with fetch()
+    rather than EventSource.
+    """
+    try:
+        chatbot_service = get_chatbot_service()
+    except Exception as e:
+        print(f"Error in chatbot endpoint: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def event_generator():
+        deltas = chatbot_service.stream_response(request.message, request.history)
+        try:
+            async for delta in deltas:
+                if await http_request.is_disconnected():
+                    return
+                yield b"data: " + orjson.dumps({'delta': delta}) + b"\n\n"
+            yield b"data: " + orjson.dumps({'done': True}) + b"\n\n"
+        except Exception as e:
+            print(f"Error in chatbot stream: {e}")
+            yield b"data: " + orjson.dumps({'error': "I'm sorry, I encountered an error. Please try again."}) + b"\n\n"
+        finally:
+            # Closes the upstream OpenAI stream now rather than at GC time
+            await deltas.aclose()
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Disable nginx buffering
+        }
+    )
@@ -3,52 +3,146 @@ AWS Configuration for EZ Common Application
 Handles DynamoDB, OpenSearch, and other AWS service configurations
 """
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 import boto3
+from botocore.config import Config
 from typing import Optional
 
-# AWS Region Configuration
-AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
-AWS_REGION_BEDROCK = os.environ.get("AWS_REGION_BEDROCK", "us-east-2")
-
-# DynamoDB Configuration
-DYNAMODB_USERS_TABLE = os.environ.get("DYNAMODB_USERS_TABLE", "ezcommon-users")
-# Table for storing organizations (optional, for future expansion)
-DYNAMODB_ORGS_TABLE = os.environ.get("DYNAMODB_ORGS_TABLE", "ezcommon-orgs")
-# Table for organization ↔ student invitations and relationships
-DYNAMODB_ORG_INVITATIONS_TABLE = os.environ.get(
-    "DYNAMODB_ORG_INVITATIONS_TABLE",
-    "ezcommon-org-invitations",
-)
 
-# OpenSearch Configuration
-OPENSEARCH_HOST = os.environ.get(
-    "OPENSEARCH_HOST",
-    "search-eiai-a3k4rgdcysqgg7y45x4dcdu7hy.us-east-1.es.amazonaws.com"
+@dataclass(frozen=True)
+class AwsSettings:
+    """AWS settings read from the environment once, at import time"""
+    region: str
+    region_bedrock: str
+    users_table: str
+    orgs_table: str
+    org_invitations_table: str
+    dynamodb_endpoint_url: Optional[str]
+    dynamodb_max_pool_connections: int
+    s3_use_accelerate_endpoint: bool
+    opensearch_host: str
+    opensearch_index: str
+    bedrock_model_arn: str
+
+    @classmethod
+    def from_env(cls) -> "AwsSettings":
+        env = os.environ
+        return cls(
+            region=env.get("AWS_REGION", "us-east-1"),
+            region_bedrock=env.get("AWS_REGION_BEDROCK", "us-east-2"),
+            users_table=env.get("DYNAMODB_USERS_TABLE", "ezcommon-users"),
+            # Table for storing organizations (optional, for future expansion)
+            orgs_table=env.get("DYNAMODB_ORGS_TABLE", "ezcommon-orgs"),
+            # Table for organization ↔ student invitations and relationships
+            org_invitations_table=env.get(
+                "DYNAMODB_ORG_INVITATIONS_TABLE",
+                "ezcommon-org-invitations",
+            ),
+            # Optional override, e.g. a VPC interface endpoint or DynamoDB Local
+            dynamodb_endpoint_url=env.get("DYNAMODB_ENDPOINT_URL") or None,
+            dynamodb_max_pool_connections=int(env.get("DYNAMODB_MAX_POOL_CONNECTIONS", "50")),
+            # Requires Transfer Acceleration enabled on the bucket; helps
+            # when the app runs far from the bucket's region
+            s3_use_accelerate_endpoint=env.get("S3_USE_ACCELERATE_ENDPOINT", "false").lower() == "true",
+            opensearch_host=env.get(
+                "OPENSEARCH_HOST",
+                "search-eiai-a3k4rgdcysqgg7y45x4dcdu7hy.us-east-1.es.amazonaws.com"
+            ),
+            opensearch_index=env.get("OPENSEARCH_INDEX", "document_chunks"),
+            bedrock_model_arn=env.get(
+                "BEDROCK_MODEL_ARN",
+                "arn:aws:bedrock:us-east-2:540764878694:inference-profile/us.anthropic.claude-3-5-sonnet-20241022-v2:0"
+            ),
+        )
+
+
+SETTINGS = AwsSettings.from_env()
+
+# Module-level names kept for existing importers
+AWS_REGION = SETTINGS.region
+AWS_REGION_BEDROCK = SETTINGS.region_bedrock
+DYNAMODB_USERS_TABLE = SETTINGS.users_table
+# Users GSIs for prefix search: (role, email_lower) and (role, name_lower)
+DYNAMODB_USERS_EMAIL_INDEX = "role-email-index"
+DYNAMODB_USERS_NAME_INDEX = "role-name-index"
+DYNAMODB_ORGS_TABLE = SETTINGS.orgs_table
+DYNAMODB_ORG_INVITATIONS_TABLE = SETTINGS.org_invitations_table
+# Invitations GSI on (org_id, status) for per-status org listings
+DYNAMODB_ORG_INVITATIONS_STATUS_INDEX = "org-status-index"
+DYNAMODB_ENDPOINT_URL = SETTINGS.dynamodb_endpoint_url
+OPENSEARCH_HOST = SETTINGS.opensearch_host
+OPENSEARCH_INDEX = SETTINGS.opensearch_index
+BEDROCK_MODEL_ARN = SETTINGS.bedrock_model_arn
+
+# Client tuning for the latency-sensitive request path
+DYNAMODB_CONFIG = Config(
+    max_pool_connections=SETTINGS.dynamodb_max_pool_connections,
+    connect_timeout=5,
+    read_timeout=10,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
 )
-OPENSEARCH_INDEX = os.environ.get("OPENSEARCH_INDEX", "document_chunks")
 
-# Bedrock Configuration
-BEDROCK_MODEL_ARN = os.environ.get(
-    "BEDROCK_MODEL_ARN",
-    "arn:aws:bedrock:us-east-2:540764878694:inference-profile/us.anthropic.claude-3-5-sonnet-20241022-v2:0"
+# Shared config for S3 and Bedrock clients
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
 )
 
+S3_CLIENT_CONFIG = AWS_CLIENT_CONFIG.merge(Config(
+    signature_version="s3v4",
+    s3={
+        "addressing_style": "virtual",
+        "use_accelerate_endpoint": SETTINGS.s3_use_accelerate_endpoint,
+    },
+))
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> boto3.Session:
+    """Single boto3 session shared by all cached clients"""
+    return boto3.Session()
+
 
+@lru_cache(maxsize=1)
 def get_dynamodb_client():
-    """Get DynamoDB client"""
-    return boto3.client('dynamodb', region_name=AWS_REGION)
+    """Get DynamoDB client (cached per process)"""
+    return _get_session().client(
+        'dynamodb',
+        region_name=SETTINGS.region,
+        endpoint_url=SETTINGS.dynamodb_endpoint_url,
+        config=DYNAMODB_CONFIG,
+    )
 
 
+@lru_cache(maxsize=1)
 def get_dynamodb_resource():
-    """Get DynamoDB resource (higher-level interface)"""
-    return boto3.resource('dynamodb', region_name=AWS_REGION)
+    """Get DynamoDB resource (higher-level interface, cached per process)"""
+    return _get_session().resource(
+        'dynamodb',
+        region_name=SETTINGS.region,
+        endpoint_url=SETTINGS.dynamodb_endpoint_url,
+        config=DYNAMODB_CONFIG,
+    )
 
 
+@lru_cache(maxsize=1)
 def get_bedrock_client():
-    """Get Bedrock runtime client"""
-    return boto3.client('bedrock-runtime', region_name=AWS_REGION_BEDROCK)
+    """Get Bedrock runtime client (cached per process)"""
+    return _get_session().client(
+        'bedrock-runtime',
+        region_name=SETTINGS.region_bedrock,
+        config=AWS_CLIENT_CONFIG,
+    )
 
 
+@lru_cache(maxsize=1)
 def get_s3_client():
-    """Get S3 client"""
-    return boto3.client('s3', region_name=AWS_REGION)
+    """Get S3 client (cached per process)"""
+    return _get_session().client(
+        's3',
+        region_name=SETTINGS.region,
+        config=S3_CLIENT_CONFIG,
+    )
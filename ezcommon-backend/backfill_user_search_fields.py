@@ -0,0 +1,73 @@
+"""
+Backfill normalized search fields on existing user records
+Writes email_lower / name_lower (and a default role) so that users created
+before these fields existed show up in the role-email / role-name GSIs.
+
+Usage:
+    python backfill_user_search_fields.py
+"""
+from aws_config import DYNAMODB_USERS_TABLE, get_dynamodb_resource
+from user_service import _name_lower
+
+
+def backfill_user_search_fields(table_name: str = DYNAMODB_USERS_TABLE) -> int:
+    """Update every user missing a normalized field; returns the number updated."""
+    table = get_dynamodb_resource().Table(table_name)
+    scan_kwargs = {
+        "ProjectionExpression": "id, email, first_name, last_name, #r, email_lower, name_lower",
+        "ExpressionAttributeNames": {"#r": "role"},
+    }
+    updated = 0
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        for user in response.get("Items", []):
+            email_lower = str(user.get("email", "")).strip().lower()
+            name_lower = _name_lower(user.get("first_name", ""), user.get("last_name", ""))
+            role = user.get("role") or "student"
+
+            if (
+                user.get("email_lower") == (email_lower or None)
+                and user.get("name_lower") == (name_lower or None)
+                and user.get("role") == role
+            ):
+                continue
+
+            # DynamoDB rejects empty strings for GSI keys: a user with no
+            # name (or email) is left out of that index instead
+            set_parts = ["#r = :r"]
+            remove_parts = []
+            values = {":r": role}
+            for attribute, placeholder, value in (
+                ("email_lower", ":el", email_lower),
+                ("name_lower", ":nl", name_lower),
+            ):
+                if value:
+                    set_parts.append(f"{attribute} = {placeholder}")
+                    values[placeholder] = value
+                else:
+                    remove_parts.append(attribute)
+            update_expression = "SET " + ", ".join(set_parts)
+            if remove_parts:
+                update_expression += " REMOVE " + ", ".join(remove_parts)
+
+            table.update_item(
+                Key={"id": user["id"]},
+                UpdateExpression=update_expression,
+                ExpressionAttributeNames={"#r": "role"},
+                ExpressionAttributeValues=values,
+            )
+            updated += 1
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        scan_kwargs["ExclusiveStartKey"] = last_key
+
+    return updated
+
+
+if __name__ == "__main__":
+    print(f"Backfilling search fields on '{DYNAMODB_USERS_TABLE}'...")
+    count = backfill_user_search_fields()
+    print(f"✓ Updated {count} user(s)")
@@ -1,9 +1,22 @@
 """
 Chatbot Service using OpenAI GPT
 """
+import asyncio
 import os
-from typing import List, Dict
-from openai import OpenAI
+from typing import AsyncIterator, List, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+CHATBOT_HISTORY_TOKEN_BUDGET = int(os.environ.get("CHATBOT_HISTORY_TOKEN_BUDGET", "3000"))
+CHATBOT_MAX_CONNECTIONS = int(os.environ.get("CHATBOT_MAX_CONNECTIONS", "100"))
+CHATBOT_MAX_KEEPALIVE = int(os.environ.get("CHATBOT_MAX_KEEPALIVE", "50"))
 
 class ChatbotService:
     def __init__(self):
@@ -12,8 +25,21 @@ class ChatbotService:
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
         
-        self.client = OpenAI(api_key=api_key)
+        # Async client with a pooled keep-alive connection so chats don't block the event loop
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=CHATBOT_MAX_CONNECTIONS,
+                    max_keepalive_connections=CHATBOT_MAX_KEEPALIVE,
+                )
+            ),
+        )
         self.model = os.environ.get("CHATBOT_MODEL", "gpt-4o-mini")
+        # Loaded lazily off the event loop (the first load may download the
+        # BPE file); token counts are estimated from length until then
+        self.encoding = None
+        self._encoding_future: Optional[asyncio.Future] = None
         
         # System prompt for the chatbot
         self.system_prompt = """You are a helpful assistant for EZCommon, an AI-powered college application autofill system. 
@@ -28,7 +54,7 @@ Your role is to help students with:
 
 Be friendly, concise, and helpful. If you don't know something specific about the platform, be honest and suggest they contact support."""
 
-    def get_response(self, user_message: str, conversation_history: List[Dict[str, str]] = None) -> str:
+    async def get_response(self, user_message: str, conversation_history: List[Dict[str, str]] = None) -> str:
         """
         Get a response from the chatbot
         
@@ -39,22 +65,12 @@ Be friendly, concise, and helpful. If you don't know something specific about th
         Returns:
             The chatbot's response
         """
+        self._load_encoding_in_background()
         try:
-            # Build messages array
-            messages = [{"role": "system", "content": self.system_prompt}]
-            
-            # Add conversation history if provided
-            if conversation_history:
-                # Only keep last 10 messages to avoid token limits
-                messages.extend(conversation_history[-10:])
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
-            
             # Call OpenAI API
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
+                messages=self._build_messages(user_message, conversation_history),
                 temperature=0.7,
                 max_tokens=500
             )
@@ -65,6 +81,91 @@ Be friendly, concise, and helpful. If you don't know something specific about th
             print(f"Error in chatbot service: {str(e)}")
             return "I'm sorry, I encountered an error. Please try again or contact support if the issue persists."
 
+    async def stream_response(self, user_message: str,
+                              conversation_history: List[Dict[str, str]] = None) -> AsyncIterator[str]:
+        """
+        Stream a response from the chatbot token by token
+        
+        Yields the text deltas as the model generates them; errors are raised
+        to the caller so it can report them on the stream.
+        """
+        self._load_encoding_in_background()
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(user_message, conversation_history),
+            temperature=0.7,
+            max_tokens=500,
+            stream=True
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Release the upstream HTTP response even if the consumer stops early
+            await stream.close()
+
+    def _build_messages(self, user_message: str,
+                        conversation_history: List[Dict[str, str]] = None) -> List[Dict[str, str]]:
+        """Build the messages array: system prompt, recent history, then the user message"""
+        messages = [{"role": "system", "content": self.system_prompt}]
+        
+        # Add conversation history if provided
+        if conversation_history:
+            # Keep the most recent messages that fit the token budget
+            messages.extend(self._trim_history(conversation_history))
+        
+        # Add current user message
+        messages.append({"role": "user", "content": user_message})
+        return messages
+
+    def _trim_history(self, conversation_history: List[Dict[str, str]],
+                      budget: int = CHATBOT_HISTORY_TOKEN_BUDGET) -> List[Dict[str, str]]:
+        """Drop the oldest messages until the history fits within ``budget`` tokens"""
+        total = 0
+        keep = []
+        for message in reversed(conversation_history):
+            tokens = self._count_tokens(message.get("content") or "")
+            if total + tokens > budget:
+                break
+            keep.append(message)
+            total += tokens
+        keep.reverse()
+        return keep
+
+    def _count_tokens(self, text: str) -> int:
+        if self.encoding is None:
+            # Rough estimate (~4 characters per token) when tiktoken is unavailable
+            return len(text) // 4 + 1
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def _load_encoding_in_background(self) -> None:
+        """Start loading the tokenizer in a worker thread (once)"""
+        if self._encoding_future is None:
+            self._encoding_future = asyncio.get_running_loop().run_in_executor(
+                None, self._load_encoding, self.model
+            )
+            self._encoding_future.add_done_callback(self._set_encoding)
+
+    def _set_encoding(self, future: asyncio.Future) -> None:
+        if not future.cancelled():
+            self.encoding = future.result()
+
+    @staticmethod
+    def _load_encoding(model: str):
+        if not HAS_TIKTOKEN:
+            print("⚠ tiktoken not installed, estimating chat history tokens from length")
+            return None
+        try:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                return tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # No network access for the first BPE download, a bad cache, ...
+            print(f"⚠ Could not load tiktoken encoding ({e}), estimating chat history tokens from length")
+            return None
+
 # Global instance
 _chatbot_service = None
 
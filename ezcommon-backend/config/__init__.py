@@ -2,10 +2,10 @@
 Configuration loader for school form questions
 Loads college_questions.json from config directory
 """
-import json
 import os
+import orjson
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 
 class ConfigLoader:
@@ -21,9 +21,12 @@ class ConfigLoader:
         return cls._instance
     
     def __init__(self):
-        """Initialize config loader"""
+        """Initialize config loader (only once, since __new__ returns the shared instance)"""
+        if getattr(self, "_ready", False):
+            return
         self.config_dir = Path(__file__).parent
         self.school_questions = None
+        self._ready = True
     
     def load_college_questions(self) -> Dict[str, Any]:
         """
@@ -35,6 +38,12 @@ class ConfigLoader:
         if self.school_questions is not None:
             return self.school_questions
         
+        # Parsed once per process and shared by every ConfigLoader instance
+        cached = self._config_cache.get("college_questions")
+        if cached is not None:
+            self.school_questions = cached
+            return cached
+        
         questions_file = self.config_dir / "college_questions.json"
         
         if not questions_file.exists():
@@ -43,15 +52,35 @@ class ConfigLoader:
             )
         
         try:
-            with open(questions_file, 'r', encoding='utf-8') as f:
-                self.school_questions = json.load(f)
+            self.school_questions = orjson.loads(questions_file.read_bytes())
+            self._index_school_questions(self.school_questions)
+            self._config_cache["college_questions"] = self.school_questions
             print(f"✓ Loaded college questions for {len(self.school_questions)} schools")
             return self.school_questions
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in college_questions.json: {e}")
         except Exception as e:
             raise RuntimeError(f"Failed to load college_questions.json: {e}")
     
+    def _index_school_questions(self, school_questions: Dict[str, Any]) -> None:
+        """Precompute flat and required question tuples for every school"""
+        all_by_school = {
+            school_id: tuple(q for questions in pages.values() for q in questions)
+            for school_id, pages in school_questions.items()
+        }
+        self._config_cache["all_questions"] = all_by_school
+        self._config_cache["required_questions"] = {
+            school_id: tuple(q for q in questions if q.get('required', False))
+            for school_id, questions in all_by_school.items()
+        }
+    
+    def _lookup_school(self, key: str, school_id: str) -> Tuple[Dict[str, Any], ...]:
+        self.load_college_questions()
+        try:
+            return self._config_cache[key][school_id]
+        except KeyError:
+            raise ValueError(f"School ID '{school_id}' not found in configuration")
+    
     def get_school_questions(self, school_id: str) -> Dict[str, Any]:
         """
         Get all questions for a specific school
@@ -69,25 +98,19 @@ class ConfigLoader:
         
         return questions[school_id]
     
-    def get_all_questions_for_school(self, school_id: str) -> list:
+    def get_all_questions_for_school(self, school_id: str) -> Tuple[Dict[str, Any], ...]:
         """
-        Get all questions for a school as a flat list
+        Get all questions for a school as a flat tuple
         
         Args:
             school_id: School ID
             
         Returns:
-            Flattened list of all questions for the school
+            Flattened tuple of all questions for the school (precomputed at load)
         """
-        school_questions = self.get_school_questions(school_id)
-        all_questions = []
-        
-        for page_url, questions in school_questions.items():
-            all_questions.extend(questions)
-        
-        return all_questions
+        return self._lookup_school("all_questions", school_id)
     
-    def get_required_questions(self, school_id: str) -> list:
+    def get_required_questions(self, school_id: str) -> Tuple[Dict[str, Any], ...]:
         """
         Get only required questions for a school
         
@@ -95,10 +118,9 @@ class ConfigLoader:
             school_id: School ID
             
         Returns:
-            List of required questions
+            Tuple of required questions (precomputed at load)
         """
-        all_questions = self.get_all_questions_for_school(school_id)
-        return [q for q in all_questions if q.get('required', False)]
+        return self._lookup_school("required_questions", school_id)
     
     @staticmethod
     def get_instance() -> "ConfigLoader":
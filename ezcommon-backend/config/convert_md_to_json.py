@@ -10,13 +10,36 @@ Usage:
 """
 
 import json
+import mmap
 import re
+import sys
+from collections import namedtuple
+from itertools import chain, islice
 from pathlib import Path
 
 
+# Column keys, in table order
+_KEYS = ("section", "subsection", "question_label", "type", "options", "logic")
+
+# One parsed row; a plain tuple underneath, turned into a dict only for JSON output
+Question = namedtuple("Question", _KEYS)
+
+# Columns drawn from a small set of values (every column but the label) are
+# interned so repeated cells share one str object
+_INTERNED = tuple(key != "question_label" for key in _KEYS)
+
+# One table row: the first six cells, skipping the header and separator rows.
+# Bytes pattern so it can run directly over the memory-mapped file.
+_ROW_RE = re.compile(
+    rb'^\|(?![ \t]*Section[ \t]*\|)(?![ \t]*:?-{3})'
+    + rb'\|'.join([rb'([^|\n]*)'] * len(_KEYS)) + rb'\|',
+    re.MULTILINE,
+)
+
+
 def parse_markdown_table(md_file_path):
     """
-    Parse markdown table and convert to JSON format
+    Parse markdown table into a list of Question rows
     
     Expected markdown format:
     | Section | Subsection | Question Label | Type | Options | Logic / Trigger |
@@ -24,59 +47,65 @@ def parse_markdown_table(md_file_path):
     | ... | ... | ... | ... | ... | ... |
     """
     
-    with open(md_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Split by lines
-    lines = content.strip().split('\n')
-    
-    # Filter out header separators and empty lines
-    data_lines = []
-    for line in lines:
-        # Skip header and separator lines
-        if line.startswith('|') and '---' not in line and 'Section' not in line:
-            data_lines.append(line)
-    
-    # Parse each data line
-    questions = []
-    
-    for line in data_lines:
-        # Remove leading/trailing pipes and split by pipe
-        cells = [cell.strip() for cell in line.split('|')[1:-1]]
-        
-        if len(cells) >= 6:
-            section = cells[0]
-            subsection = cells[1]
-            question_label = cells[2]
-            question_type = cells[3]
-            options = cells[4]
-            logic = cells[5]
-            
-            # Create question object
-            question = {
-                "section": section,
-                "subsection": subsection,
-                "question_label": question_label,
-                "type": question_type,
-                "options": options,
-                "logic": logic
-            }
-            
-            questions.append(question)
-    
-    return questions
+    return list(_iter_rows(md_file_path))
+
+
+def _iter_rows(md_file_path):
+    """Yield the table's Question rows one at a time"""
+    with open(md_file_path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return
+        # Map the file instead of reading it; only matched cells are decoded
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            # Match every data row in one pass over the file
+            for match in _ROW_RE.finditer(content):
+                yield _to_question(match.groups())
+
+
+def _to_question(cells):
+    """Decode one row's cells into a Question, interning the repetitive columns"""
+    return Question._make(
+        sys.intern(value) if intern else value
+        for value, intern in zip((cell.decode('utf-8').strip() for cell in cells), _INTERNED)
+    )
 
 
 def save_to_json(questions, output_file_path):
     """Save questions to JSON file"""
     
-    with open(output_file_path, 'w', encoding='utf-8') as f:
-        json.dump(questions, f, indent=2, ensure_ascii=False)
+    # Compact ASCII output takes the encoder's fast path; consumers only json.load it
+    with open(output_file_path, 'w', encoding='ascii', buffering=1 << 20) as f:
+        json.dump([q._asdict() for q in questions], f, ensure_ascii=True, separators=(",", ":"), check_circular=False)
     
     print(f"✅ Successfully converted! Saved to: {output_file_path}")
     print(f"📊 Total questions: {len(questions)}")
 
 
+def stream_convert(md_file_path, output_file_path):
+    """
+    Convert the markdown table to JSON one row at a time
+    
+    Writes the same compact output as save_to_json without holding every
+    row in memory. Returns the number of questions written; nothing is
+    written if the table has no rows.
+    """
+    rows = _iter_rows(md_file_path)
+    first = next(rows, None)
+    if first is None:
+        return 0
+    
+    count = 0
+    with open(output_file_path, 'w', encoding='ascii', buffering=1 << 20) as out:
+        out.write('[')
+        for question in chain((first,), rows):
+            if count:
+                out.write(',')
+            out.write(json.dumps(question._asdict(), ensure_ascii=True, separators=(",", ":"), check_circular=False))
+            count += 1
+        out.write(']')
+    return count
+
+
 def main():
     """Main function"""
     
@@ -92,21 +121,21 @@ def main():
     
     print(f"📄 Reading markdown file: {md_file}")
     
-    # Parse markdown
-    questions = parse_markdown_table(md_file)
+    # Parse markdown and save to JSON row by row
+    print(f"💾 Converting to JSON format...")
+    count = stream_convert(md_file, json_file)
     
-    if not questions:
+    if not count:
         print("❌ Error: No questions found in markdown file!")
         return
     
-    # Save to JSON
-    print(f"💾 Converting to JSON format...")
-    save_to_json(questions, json_file)
+    print(f"✅ Successfully converted! Saved to: {json_file}")
+    print(f"📊 Total questions: {count}")
     
     # Print sample
     print("\n📋 Sample (first 3 questions):")
-    for q in questions[:3]:
-        print(json.dumps(q, indent=2, ensure_ascii=False))
+    for q in islice(_iter_rows(md_file), 3):
+        print(json.dumps(q._asdict(), indent=2, ensure_ascii=False))
         print("---")
 
 
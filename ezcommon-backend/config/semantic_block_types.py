@@ -4,8 +4,10 @@ Semantic Block Types for College Application Documents
 These 11 core block types are designed to work with ANY college application,
 regardless of which specific documents or schools are involved.
 """
+from types import MappingProxyType
 
-SEMANTIC_BLOCK_TYPES = {
+# Read-only at module level so no caller can mutate the shared definitions
+SEMANTIC_BLOCK_TYPES = MappingProxyType({
     "PERSONAL_PROFILE": {
         "description": "Student's identity, contact information, and biographical data",
         "includes": [
@@ -172,21 +174,21 @@ SEMANTIC_BLOCK_TYPES = {
         "from_documents": ["Application metadata sections", "Affirmations page"],
         "use_case": "Answer: 'What is the application processing status?'"
     }
-}
+})
 
 # Summary of block types
-BLOCK_TYPE_NAMES = list(SEMANTIC_BLOCK_TYPES.keys())
+BLOCK_TYPE_NAMES = tuple(SEMANTIC_BLOCK_TYPES)
+_BLOCK_TYPE_SET = frozenset(BLOCK_TYPE_NAMES)
 
 def get_block_type_description(block_type: str) -> str:
     """Get the description for a block type"""
-    if block_type in SEMANTIC_BLOCK_TYPES:
-        return SEMANTIC_BLOCK_TYPES[block_type]["description"]
-    return "Unknown block type"
+    entry = SEMANTIC_BLOCK_TYPES.get(block_type)
+    return entry["description"] if entry else "Unknown block type"
 
-def get_all_block_types() -> list:
-    """Get list of all available block types"""
+def get_all_block_types() -> tuple:
+    """Get all available block types (immutable, in definition order)"""
     return BLOCK_TYPE_NAMES
 
 def validate_block_type(block_type: str) -> bool:
     """Check if a block type is valid"""
-    return block_type in SEMANTIC_BLOCK_TYPES
+    return block_type in _BLOCK_TYPE_SET
@@ -0,0 +1,21 @@
+"""
+Gunicorn configuration for EZ Common Backend
+
+Usage:
+    gunicorn -c gunicorn.conf.py auth_api:app
+
+preload_app imports auth_api once in the master so module code and
+configuration are shared copy-on-write with every worker. Anything holding a
+socket or file handle that must not cross fork (the search provider and the
+parse / form fill services built on it) is created in each worker's startup
+hook instead, and backend connections are opened there too.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2 * multiprocessing.cpu_count() + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+keepalive = 5
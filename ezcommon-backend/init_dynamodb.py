@@ -2,22 +2,101 @@
 Initialize DynamoDB tables for EZ Common Application
 Creates the users table with proper indexes
 """
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Set
+
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from aws_config import (
     AWS_REGION,
+    DYNAMODB_ENDPOINT_URL,
     DYNAMODB_USERS_TABLE,
     DYNAMODB_ORGS_TABLE,
     DYNAMODB_ORG_INVITATIONS_TABLE,
-    get_dynamodb_client,
+    DYNAMODB_ORG_INVITATIONS_STATUS_INDEX,
+    DYNAMODB_USERS_EMAIL_INDEX,
+    DYNAMODB_USERS_NAME_INDEX,
+)
+
+# Control-plane calls (CreateTable, UpdateTable, DescribeTable) from several
+# threads at once: retry throttling patiently instead of failing the init
+INIT_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={"max_attempts": 10, "mode": "adaptive"},
 )
 
+_client = None
+
+
+def get_dynamodb_client():
+    """DynamoDB client shared by every init step"""
+    global _client
+    if _client is None:
+        _client = boto3.client(
+            'dynamodb',
+            region_name=AWS_REGION,
+            endpoint_url=DYNAMODB_ENDPOINT_URL,
+            config=INIT_CLIENT_CONFIG,
+        )
+    return _client
+
+
+def _users_search_index(index_name: str, sort_key: str) -> dict:
+    """GSI on (role, sort_key) used for prefix search over students."""
+    return {
+        'IndexName': index_name,
+        'KeySchema': [
+            {'AttributeName': 'role', 'KeyType': 'HASH'},
+            {'AttributeName': sort_key, 'KeyType': 'RANGE'},
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+        'ProvisionedThroughput': {
+            'ReadCapacityUnits': 5,
+            'WriteCapacityUnits': 5
+        }
+    }
+
+
+def _org_status_index() -> dict:
+    """GSI on (org_id, status) so an org's accepted students are read directly."""
+    return {
+        "IndexName": DYNAMODB_ORG_INVITATIONS_STATUS_INDEX,
+        "KeySchema": [
+            {"AttributeName": "org_id", "KeyType": "HASH"},
+            {"AttributeName": "status", "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+        "ProvisionedThroughput": {
+            "ReadCapacityUnits": 5,
+            "WriteCapacityUnits": 5,
+        },
+    }
+
+
+USERS_SEARCH_INDEXES = (
+    (DYNAMODB_USERS_EMAIL_INDEX, 'email_lower'),
+    (DYNAMODB_USERS_NAME_INDEX, 'name_lower'),
+)
 
-def create_users_table(table_name: str = DYNAMODB_USERS_TABLE):
+
+def list_existing_tables(dynamodb=None) -> Set[str]:
+    """Names of all DynamoDB tables in the region (follows list_tables pagination)"""
+    dynamodb = dynamodb or get_dynamodb_client()
+    names: Set[str] = set()
+    for page in dynamodb.get_paginator('list_tables').paginate():
+        names.update(page['TableNames'])
+    return names
+
+
+def create_users_table(table_name: str = DYNAMODB_USERS_TABLE,
+                       existing: Optional[Set[str]] = None):
     """
     Create DynamoDB users table with the following schema:
     - id (String, Primary Key): UUID for user
     - email (String, GSI): User email (unique)
+    - role + email_lower / role + name_lower (GSIs): prefix search
     - first_name (String): User's first name
     - last_name (String): User's last name
     - password_hash (String): Hashed password
@@ -28,8 +107,9 @@ def create_users_table(table_name: str = DYNAMODB_USERS_TABLE):
 
     try:
         # Check if table already exists
-        existing_tables = dynamodb.list_tables()['TableNames']
-        if table_name in existing_tables:
+        if existing is None:
+            existing = list_existing_tables(dynamodb)
+        if table_name in existing:
             print(f"✓ Table '{table_name}' already exists")
             return True
 
@@ -52,7 +132,10 @@ def create_users_table(table_name: str = DYNAMODB_USERS_TABLE):
                 {
                     'AttributeName': 'email',
                     'AttributeType': 'S'  # String
-                }
+                },
+                {'AttributeName': 'role', 'AttributeType': 'S'},
+                {'AttributeName': 'email_lower', 'AttributeType': 'S'},
+                {'AttributeName': 'name_lower', 'AttributeType': 'S'},
             ],
             GlobalSecondaryIndexes=[
                 {
@@ -70,7 +153,8 @@ def create_users_table(table_name: str = DYNAMODB_USERS_TABLE):
                         'ReadCapacityUnits': 5,
                         'WriteCapacityUnits': 5
                     }
-                }
+                },
+                *(_users_search_index(name, key) for name, key in USERS_SEARCH_INDEXES),
             ],
             ProvisionedThroughput={
                 'ReadCapacityUnits': 5,
@@ -109,13 +193,59 @@ def create_users_table(table_name: str = DYNAMODB_USERS_TABLE):
             print(f"✗ Error creating table: {e}")
             return False
 
-def create_orgs_table(table_name: str = DYNAMODB_ORGS_TABLE):
+def create_users_search_indexes(table_name: str = DYNAMODB_USERS_TABLE):
+    """Add the prefix-search GSIs to an existing users table if missing.
+
+    DynamoDB only allows one GSI to be created per UpdateTable call, so the
+    indexes are added one at a time, waiting for each to become active.
+    """
+    dynamodb = get_dynamodb_client()
+
+    try:
+        table = dynamodb.describe_table(TableName=table_name)['Table']
+        existing = {gsi['IndexName'] for gsi in table.get('GlobalSecondaryIndexes', [])}
+
+        for index_name, sort_key in USERS_SEARCH_INDEXES:
+            if index_name in existing:
+                print(f"✓ Index '{index_name}' already exists")
+                continue
+
+            print(f"Creating index '{index_name}' on '{table_name}'...")
+            dynamodb.update_table(
+                TableName=table_name,
+                AttributeDefinitions=[
+                    {'AttributeName': 'role', 'AttributeType': 'S'},
+                    {'AttributeName': sort_key, 'AttributeType': 'S'},
+                ],
+                GlobalSecondaryIndexUpdates=[
+                    {'Create': _users_search_index(index_name, sort_key)}
+                ],
+            )
+            waiter = dynamodb.get_waiter('table_exists')
+            while True:
+                waiter.wait(TableName=table_name)
+                indexes = dynamodb.describe_table(TableName=table_name)['Table'].get('GlobalSecondaryIndexes', [])
+                if all(gsi['IndexStatus'] == 'ACTIVE' for gsi in indexes):
+                    break
+                time.sleep(10)
+            print(f"✓ Index '{index_name}' is now active!")
+
+        return True
+
+    except ClientError as e:
+        print(f"✗ Error creating search indexes: {e}")
+        return False
+
+
+def create_orgs_table(table_name: str = DYNAMODB_ORGS_TABLE,
+                      existing: Optional[Set[str]] = None):
     """Create DynamoDB table for organizations (simple id-based table)."""
     dynamodb = get_dynamodb_client()
 
     try:
-        existing_tables = dynamodb.list_tables()["TableNames"]
-        if table_name in existing_tables:
+        if existing is None:
+            existing = list_existing_tables(dynamodb)
+        if table_name in existing:
             print(f"✓ Table '{table_name}' already exists")
             return True
 
@@ -152,20 +282,23 @@ def create_orgs_table(table_name: str = DYNAMODB_ORGS_TABLE):
 
 def create_org_invitations_table(
     table_name: str = DYNAMODB_ORG_INVITATIONS_TABLE,
+    existing: Optional[Set[str]] = None,
 ):
     """Create DynamoDB table for organization ↔ student invitations.
 
     Schema:
     - org_id (HASH): organization identifier
     - student_id (RANGE): student user id
-    GSI:
+    GSIs:
     - student-index on (student_id)
+    - org-status-index on (org_id, status)
     """
     dynamodb = get_dynamodb_client()
 
     try:
-        existing_tables = dynamodb.list_tables()["TableNames"]
-        if table_name in existing_tables:
+        if existing is None:
+            existing = list_existing_tables(dynamodb)
+        if table_name in existing:
             print(f"✓ Table '{table_name}' already exists")
             return True
 
@@ -179,6 +312,7 @@ def create_org_invitations_table(
             AttributeDefinitions=[
                 {"AttributeName": "org_id", "AttributeType": "S"},
                 {"AttributeName": "student_id", "AttributeType": "S"},
+                {"AttributeName": "status", "AttributeType": "S"},
             ],
             GlobalSecondaryIndexes=[
                 {
@@ -191,7 +325,8 @@ def create_org_invitations_table(
                         "ReadCapacityUnits": 5,
                         "WriteCapacityUnits": 5,
                     },
-                }
+                },
+                _org_status_index(),
             ],
             ProvisionedThroughput={"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
             Tags=[
@@ -220,6 +355,42 @@ def create_org_invitations_table(
 
 
 
+def create_org_status_index(table_name: str = DYNAMODB_ORG_INVITATIONS_TABLE):
+    """Add the (org_id, status) GSI to an existing invitations table if missing."""
+    dynamodb = get_dynamodb_client()
+
+    try:
+        table = dynamodb.describe_table(TableName=table_name)["Table"]
+        existing = {gsi["IndexName"] for gsi in table.get("GlobalSecondaryIndexes", [])}
+        if DYNAMODB_ORG_INVITATIONS_STATUS_INDEX in existing:
+            print(f"✓ Index '{DYNAMODB_ORG_INVITATIONS_STATUS_INDEX}' already exists")
+            return True
+
+        print(f"Creating index '{DYNAMODB_ORG_INVITATIONS_STATUS_INDEX}' on '{table_name}'...")
+        dynamodb.update_table(
+            TableName=table_name,
+            AttributeDefinitions=[
+                {"AttributeName": "org_id", "AttributeType": "S"},
+                {"AttributeName": "status", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexUpdates=[{"Create": _org_status_index()}],
+        )
+        waiter = dynamodb.get_waiter("table_exists")
+        while True:
+            waiter.wait(TableName=table_name)
+            indexes = dynamodb.describe_table(TableName=table_name)["Table"].get("GlobalSecondaryIndexes", [])
+            if all(gsi["IndexStatus"] == "ACTIVE" for gsi in indexes):
+                break
+            time.sleep(10)
+        print(f"✓ Index '{DYNAMODB_ORG_INVITATIONS_STATUS_INDEX}' is now active!")
+        return True
+
+    except ClientError as e:
+        print(f"✗ Error creating org status index: {e}")
+        return False
+
+
+
 def describe_table(table_name: str = DYNAMODB_USERS_TABLE):
     """Describe the users table"""
     dynamodb = get_dynamodb_client()
@@ -292,12 +463,29 @@ def main():
     print(f"Orgs Table: {DYNAMODB_ORGS_TABLE}")
     print(f"Org Invitations Table: {DYNAMODB_ORG_INVITATIONS_TABLE}\n")
 
-    # Create users table
-    success_users = create_users_table()
-    # Create organizations table (optional)
-    success_orgs = create_orgs_table()
-    # Create org invitations table
-    success_invites = create_org_invitations_table()
+    # One list_tables pass shared by every creator
+    try:
+        existing = list_existing_tables()
+    except ClientError as e:
+        print(f"✗ Error listing tables: {e}")
+        return
+
+    # The tables are independent, so provision them in parallel; each
+    # creator mostly waits on its table_exists waiter
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        # Create users table
+        users = executor.submit(
+            lambda: create_users_table(existing=existing) and create_users_search_indexes()
+        )
+        # Create organizations table (optional)
+        orgs = executor.submit(create_orgs_table, existing=existing)
+        # Create org invitations table
+        invites = executor.submit(
+            lambda: create_org_invitations_table(existing=existing) and create_org_status_index()
+        )
+        success_users = users.result()
+        success_orgs = orgs.result()
+        success_invites = invites.result()
 
     if success_users and success_orgs and success_invites:
         # Describe the users table as a sanity check
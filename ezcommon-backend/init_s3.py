@@ -12,6 +12,9 @@ load_dotenv()
 
 from s3_service import get_s3_service
 
+# Set to run the upload/list/delete smoke test after the bucket check
+S3_INIT_VERIFY = bool(os.environ.get("EZ_S3_INIT_VERIFY"))
+
 
 def main():
     """Initialize S3 bucket"""
@@ -33,49 +36,27 @@ def main():
         print("✅ S3 bucket is ready!")
         print()
         
-        # Test upload
-        print("Testing file upload...")
-        test_content = b"This is a test file for EZ Common"
-        result = s3_service.upload_file(
-            file_content=test_content,
-            filename="test.txt",
-            user_id="test-user",
-            section="profile",
-            content_type="text/plain"
-        )
-        
-        if result['success']:
-            print("✅ Test upload successful!")
-            print(f"   S3 Key: {result['s3_key']}")
-            print(f"   URL: {result['url'][:80]}...")
-            print()
-            
-            # Test listing
-            print("Testing file listing...")
-            files = s3_service.list_user_files(user_id="test-user", section="profile")
-            print(f"✅ Found {len(files)} file(s)")
-            print()
-            
-            # Clean up test file
-            print("Cleaning up test file...")
-            if s3_service.delete_file(result['s3_key']):
-                print("✅ Test file deleted")
-            print()
-            
-            print("=" * 60)
-            print("S3 Initialization Complete!")
-            print("=" * 60)
-            print()
-            print("Your S3 bucket is ready to accept file uploads.")
-            print()
-            print("Next steps:")
-            print("1. Make sure your .env file has the correct AWS credentials")
-            print("2. Start the API server: python auth_api.py")
-            print("3. Test file uploads from the frontend")
-            print()
+        print("Setting Vision OCR cache expiration...")
+        if s3_service.ensure_vision_cache_expiration():
+            print("✅ Vision OCR cache expiration rule is set")
         else:
-            print(f"❌ Test upload failed: {result.get('error')}")
-            sys.exit(1)
+            print("⚠ Could not set the Vision OCR cache expiration rule")
+        print()
+        
+        if S3_INIT_VERIFY:
+            verify_bucket(s3_service)
+        
+        print("=" * 60)
+        print("S3 Initialization Complete!")
+        print("=" * 60)
+        print()
+        print("Your S3 bucket is ready to accept file uploads.")
+        print()
+        print("Next steps:")
+        print("1. Make sure your .env file has the correct AWS credentials")
+        print("2. Start the API server: python auth_api.py")
+        print("3. Test file uploads from the frontend")
+        print()
     else:
         print("❌ Failed to initialize S3 bucket")
         print()
@@ -86,6 +67,41 @@ def main():
         sys.exit(1)
 
 
+def verify_bucket(s3_service):
+    """Smoke test the bucket with a test upload, listing and delete"""
+    # Test upload
+    print("Testing file upload...")
+    test_content = b"This is a test file for EZ Common"
+    result = s3_service.upload_file(
+        file_content=test_content,
+        filename="test.txt",
+        user_id="test-user",
+        section="profile",
+        content_type="text/plain"
+    )
+    
+    if result['success']:
+        print("✅ Test upload successful!")
+        print(f"   S3 Key: {result['s3_key']}")
+        print(f"   URL: {result['url'][:80]}...")
+        print()
+        
+        # Test listing
+        print("Testing file listing...")
+        files = s3_service.list_user_files(user_id="test-user", section="profile")
+        print(f"✅ Found {len(files)} file(s)")
+        print()
+        
+        # Clean up test file
+        print("Cleaning up test file...")
+        if s3_service.delete_file(result['s3_key']):
+            print("✅ Test file deleted")
+        print()
+    else:
+        print(f"❌ Test upload failed: {result.get('error')}")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
 
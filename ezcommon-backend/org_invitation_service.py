@@ -1,9 +1,24 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timezone
+import logging
+import time
+from typing import Iterator, List, Dict, Any, Optional
+from functools import lru_cache
 
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
-from aws_config import DYNAMODB_ORG_INVITATIONS_TABLE, get_dynamodb_resource
+from aws_config import (
+    DYNAMODB_ORG_INVITATIONS_TABLE,
+    DYNAMODB_ORG_INVITATIONS_STATUS_INDEX,
+    get_dynamodb_resource,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _get_table(table_name: str):
+    """Table resource shared by every OrgInvitationService for that table"""
+    return get_dynamodb_resource().Table(table_name)
 
 
 class OrgInvitationService:
@@ -14,13 +29,39 @@ class OrgInvitationService:
     organization membership when status == "accepted".
     """
 
+    # update_status expressions, shared across calls. botocore only accepts a
+    # real dict for the names map; the expressions are plain strings, so boto3
+    # never adds to it (treat it as read-only)
+    _STATUS_UPDATE_EXPR = "SET #s = :s, updated_at = :ua"
+    _STATUS_CONDITION_EXPR = "attribute_exists(org_id) AND attribute_exists(student_id)"
+    _STATUS_ATTR_NAMES = {"#s": "status"}
+
+    # Fixed keys of a new invitation, copied per item
+    _ITEM_TEMPLATE = {
+        "org_id": None,
+        "student_id": None,
+        "status": "pending",
+        "created_at": None,
+        "updated_at": None,
+    }
+
     def __init__(self, table_name: str = DYNAMODB_ORG_INVITATIONS_TABLE) -> None:
         self.dynamodb = get_dynamodb_resource()
-        self.table = self.dynamodb.Table(table_name)
+        self.table = _get_table(table_name)
 
     @staticmethod
     def _utc_now() -> str:
-        return datetime.now(timezone.utc).isoformat()
+        """ISO-8601 UTC timestamp, formatted without building datetime objects.
+
+        Same shape as datetime.now(timezone.utc).isoformat(), except that the
+        microseconds are always present.
+        """
+        seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+        tm = time.gmtime(seconds)
+        return "%04d-%02d-%02dT%02d:%02d:%02d.%06d+00:00" % (
+            tm.tm_year, tm.tm_mon, tm.tm_mday,
+            tm.tm_hour, tm.tm_min, tm.tm_sec, nanos // 1000,
+        )
 
     def create_invitation(
         self,
@@ -36,15 +77,59 @@ class OrgInvitationService:
         reset to "pending" and timestamps updated.
         """
 
+        item = self._build_invitation(
+            org_id, student_id, self._utc_now(), org_name, created_by_user_id, message
+        )
+
+        try:
+            self.table.put_item(Item=item)
+            return item
+        except ClientError:
+            logger.exception("Error creating org invitation")
+            raise
+
+    def bulk_create_invitations(
+        self,
+        org_id: str,
+        student_ids: List[str],
+        org_name: Optional[str] = None,
+        created_by_user_id: Optional[str] = None,
+        message: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Create or overwrite invitations from org → many students.
+
+        Writes go through BatchWriteItem (25 items per request, unprocessed
+        items retried by the batch writer). Duplicate student ids are written once.
+        """
+
         now = self._utc_now()
+        items = [
+            self._build_invitation(org_id, student_id, now, org_name, created_by_user_id, message)
+            for student_id in dict.fromkeys(student_ids)
+        ]
+
+        try:
+            with self.table.batch_writer(overwrite_by_pkeys=["org_id", "student_id"]) as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+            return items
+        except ClientError:
+            logger.exception("Error bulk creating org invitations")
+            raise
 
-        item: Dict[str, Any] = {
-            "org_id": org_id,
-            "student_id": student_id,
-            "status": "pending",
-            "created_at": now,
-            "updated_at": now,
-        }
+    @staticmethod
+    def _build_invitation(
+        org_id: str,
+        student_id: str,
+        now: str,
+        org_name: Optional[str],
+        created_by_user_id: Optional[str],
+        message: Optional[str],
+    ) -> Dict[str, Any]:
+        item: Dict[str, Any] = OrgInvitationService._ITEM_TEMPLATE.copy()
+        item["org_id"] = org_id
+        item["student_id"] = student_id
+        item["created_at"] = item["updated_at"] = now
 
         if org_name is not None:
             item["org_name"] = org_name
@@ -52,13 +137,7 @@ class OrgInvitationService:
             item["created_by_user_id"] = created_by_user_id
         if message is not None:
             item["message"] = message
-
-        try:
-            self.table.put_item(Item=item)
-            return item
-        except ClientError as e:
-            print(f"Error creating org invitation: {e}")
-            raise
+        return item
 
     def update_status(
         self,
@@ -76,49 +155,68 @@ class OrgInvitationService:
         try:
             response = self.table.update_item(
                 Key={"org_id": org_id, "student_id": student_id},
-                UpdateExpression="SET #s = :s, updated_at = :ua",
-                ExpressionAttributeNames={"#s": "status"},
+                UpdateExpression=self._STATUS_UPDATE_EXPR,
+                ExpressionAttributeNames=self._STATUS_ATTR_NAMES,
                 ExpressionAttributeValues={
                     ":s": status,
                     ":ua": now,
                 },
-                ConditionExpression="attribute_exists(org_id) AND attribute_exists(student_id)",
+                ConditionExpression=self._STATUS_CONDITION_EXPR,
                 ReturnValues="ALL_NEW",
             )
         except ClientError as e:
             # Conditional check failed → item does not exist
             if e.response["Error"].get("Code") == "ConditionalCheckFailedException":
                 return None
-            print(f"Error updating org invitation status: {e}")
+            logger.exception("Error updating org invitation status")
             raise
 
         return response.get("Attributes")
 
+    def _iter_query(self, **query_kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield every item of a query, following LastEvaluatedKey past the 1 MB page cap."""
+
+        while True:
+            response = self.table.query(**query_kwargs)
+            yield from response.get("Items", [])
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            query_kwargs["ExclusiveStartKey"] = last_key
+
+    def iter_invitations_for_student(self, student_id: str) -> Iterator[Dict[str, Any]]:
+        """Lazily yield all invitations for a given student (via GSI)."""
+
+        return self._iter_query(
+            IndexName="student-index",
+            KeyConditionExpression="student_id = :sid",
+            ExpressionAttributeValues={":sid": student_id},
+        )
+
+    def iter_invitations_for_org(self, org_id: str) -> Iterator[Dict[str, Any]]:
+        """Lazily yield all invitations for a given organization (partition query)."""
+
+        return self._iter_query(
+            KeyConditionExpression="org_id = :oid",
+            ExpressionAttributeValues={":oid": org_id},
+        )
+
     def get_invitations_for_student(self, student_id: str) -> List[Dict[str, Any]]:
         """List invitations for a given student (via GSI)."""
 
         try:
-            response = self.table.query(
-                IndexName="student-index",
-                KeyConditionExpression="student_id = :sid",
-                ExpressionAttributeValues={":sid": student_id},
-            )
-            return response.get("Items", [])
-        except ClientError as e:
-            print(f"Error querying invitations for student: {e}")
+            return list(self.iter_invitations_for_student(student_id))
+        except ClientError:
+            logger.exception("Error querying invitations for student")
             return []
 
     def get_invitations_for_org(self, org_id: str) -> List[Dict[str, Any]]:
         """List invitations for a given organization (partition query)."""
 
         try:
-            response = self.table.query(
-                KeyConditionExpression="org_id = :oid",
-                ExpressionAttributeValues={":oid": org_id},
-            )
-            return response.get("Items", [])
-        except ClientError as e:
-            print(f"Error querying invitations for org: {e}")
+            return list(self.iter_invitations_for_org(org_id))
+        except ClientError:
+            logger.exception("Error querying invitations for org")
             return []
 
     def delete_invitation(self, org_id: str, student_id: str) -> bool:
@@ -127,8 +225,8 @@ class OrgInvitationService:
         try:
             self.table.delete_item(Key={"org_id": org_id, "student_id": student_id})
             return True
-        except ClientError as e:
-            print(f"Error deleting org invitation: {e}")
+        except ClientError:
+            logger.exception("Error deleting org invitation")
             return False
 
     def get_accepted_students_for_org(self, org_id: str) -> List[Dict[str, Any]]:
@@ -137,6 +235,53 @@ class OrgInvitationService:
         These represent the students that the org can manage.
         """
 
-        items = self.get_invitations_for_org(org_id)
-        return [item for item in items if item.get("status") == "accepted"]
+        return self.get_invitations_for_org_by_status(org_id, "accepted")
+
+    def iter_accepted_student_ids(self, org_id: str) -> Iterator[str]:
+        """Lazily yield the ids of students that accepted an org's invitations.
+
+        Only the student_id attribute is read back, page by page.
+        """
+
+        for item in self._iter_org_status_items(org_id, "accepted", ProjectionExpression="student_id"):
+            yield item["student_id"]
+
+    def _iter_org_status_items(self, org_id: str, status: str, **query_kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield an org's items with a status, via the GSI or a filtered partition query."""
+
+        try:
+            try:
+                items = self._iter_query(
+                    IndexName=DYNAMODB_ORG_INVITATIONS_STATUS_INDEX,
+                    KeyConditionExpression=Key("org_id").eq(org_id) & Key("status").eq(status),
+                    **query_kwargs,
+                )
+                first = next(items, None)
+            except ClientError as e:
+                # Tables created before the index existed
+                if e.response["Error"].get("Code") != "ValidationException":
+                    raise
+                items = self._iter_query(
+                    KeyConditionExpression=Key("org_id").eq(org_id),
+                    FilterExpression=Attr("status").eq(status),
+                    **query_kwargs,
+                )
+                first = next(items, None)
+
+            if first is None:
+                return
+            yield first
+            yield from items
+        except ClientError:
+            logger.exception("Error querying %s invitations for org", status)
+
+    def get_invitations_for_org_by_status(self, org_id: str, status: str) -> List[Dict[str, Any]]:
+        """List an org's invitations with the given status.
+
+        Reads only matching items through the (org_id, status) GSI. Tables
+        created before the index existed fall back to a partition query with
+        the status filter applied by DynamoDB.
+        """
+
+        return list(self._iter_org_status_items(org_id, status))
 
@@ -1,11 +1,24 @@
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Iterable, List
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from botocore.exceptions import ClientError
 
 from aws_config import DYNAMODB_ORGS_TABLE, get_dynamodb_resource
 
 
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_RETRIES = 5
+
+
+@lru_cache(maxsize=None)
+def _get_table(table_name: str):
+    """Table resource shared by every OrgService for that table"""
+    return get_dynamodb_resource().Table(table_name)
+
+
 class OrgService:
     """Simple service for managing organizations.
 
@@ -15,7 +28,7 @@ class OrgService:
 
     def __init__(self, table_name: str = DYNAMODB_ORGS_TABLE) -> None:
         self.dynamodb = get_dynamodb_resource()
-        self.table = self.dynamodb.Table(table_name)
+        self.table = _get_table(table_name)
 
     @staticmethod
     def _utc_now() -> str:
@@ -50,13 +63,71 @@ class OrgService:
             print(f"Error creating organization: {e}")
             raise
 
-    def get_org_by_id(self, org_id: str) -> Optional[Dict[str, Any]]:
-        """Fetch organization by id, returns None if not found."""
+    @staticmethod
+    def _projection_kwargs(projection: Optional[Iterable[str]]) -> Dict[str, Any]:
+        """ProjectionExpression arguments for a list of attribute names.
+
+        Names are always aliased so reserved words (e.g. "name") are allowed.
+        """
+
+        if not projection:
+            return {}
+        names = {f"#{attr}": attr for attr in projection}
+        return {
+            "ProjectionExpression": ", ".join(names),
+            "ExpressionAttributeNames": names,
+        }
+
+    def get_org_by_id(
+        self, org_id: str, projection: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch organization by id, returns None if not found.
+
+        Pass projection to read only those attributes.
+        """
 
         try:
-            response = self.table.get_item(Key={"id": org_id})
+            response = self.table.get_item(
+                Key={"id": org_id}, **self._projection_kwargs(projection)
+            )
             return response.get("Item")
         except ClientError as e:
             print(f"Error getting organization by id: {e}")
             return None
 
+    def get_orgs_by_ids(
+        self, org_ids: List[str], projection: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch many organizations with BatchGetItem, 100 keys per request.
+
+        Returns a dict of org_id -> org for the organizations that exist.
+        A projection must include "id" for the result to be keyed.
+        """
+
+        if projection and "id" not in projection:
+            projection = ["id", *projection]
+        unique_ids = list(dict.fromkeys(org_id for org_id in org_ids if org_id))
+        table_name = self.table.name
+        orgs: Dict[str, Dict[str, Any]] = {}
+
+        for start in range(0, len(unique_ids), BATCH_GET_MAX_KEYS):
+            request = {table_name: {
+                "Keys": [{"id": org_id} for org_id in unique_ids[start:start + BATCH_GET_MAX_KEYS]],
+                **self._projection_kwargs(projection),
+            }}
+            try:
+                for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+                    response = self.dynamodb.batch_get_item(RequestItems=request)
+                    for item in response.get("Responses", {}).get(table_name, []):
+                        orgs[item["id"]] = item
+                    request = response.get("UnprocessedKeys") or {}
+                    if not request:
+                        break
+                    time.sleep(min(0.05 * (2 ** attempt), 1.0))
+                else:
+                    print(f"Warning: {len(request[table_name]['Keys'])} org keys left unprocessed")
+            except ClientError as e:
+                print(f"Error batch getting organizations: {e}")
+
+        return orgs
+
@@ -4,11 +4,17 @@ This includes listing user files and parsing them with full OpenSearch integrati
 """
 
 # Add these imports at the top of auth_api.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from document_parse_service import DocumentParseService
 
 # Initialize parse service (add after user_service initialization)
 parse_service = DocumentParseService()
 
+# Batch parsing runs files concurrently, bounded so Bedrock/OpenSearch aren't flooded
+PARSE_POOL = ThreadPoolExecutor(max_workers=8)
+PARSE_SEM = asyncio.Semaphore(8)
+
 
 # Models for Parse API
 class FileInfo(BaseModel):
@@ -85,7 +91,10 @@ async def parse_file_from_s3(body: ParseFileRequest, user_id: str = Query(...)):
     5. Returns detailed results including extracted chunks
     """
     try:
-        result = parse_service.process_file_from_s3(body.s3_key, user_id)
+        # S3 download + PDF/vision processing take seconds; keep them off the event loop
+        result = await asyncio.get_running_loop().run_in_executor(
+            PARSE_POOL, parse_service.process_file_from_s3, body.s3_key, user_id
+        )
         return result
     except ValueError as e:
         raise HTTPException(
@@ -113,18 +122,23 @@ async def parse_batch_files(
     - **s3_keys**: List of S3 object keys
     - **user_id**: User ID for tracking
     """
-    results = []
-    
-    for s3_key in s3_keys:
-        try:
-            result = parse_service.process_file_from_s3(s3_key, user_id)
-            results.append(result)
-        except Exception as e:
-            results.append({
-                "status": "error",
-                "s3_key": s3_key,
-                "error": str(e)
-            })
+    loop = asyncio.get_running_loop()
+
+    async def parse_one(s3_key: str) -> Dict[str, Any]:
+        async with PARSE_SEM:
+            try:
+                return await loop.run_in_executor(
+                    PARSE_POOL, parse_service.process_file_from_s3, s3_key, user_id
+                )
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "s3_key": s3_key,
+                    "error": str(e)
+                }
+
+    # Files are independent; total time approaches the slowest single file
+    results = await asyncio.gather(*(parse_one(s3_key) for s3_key in s3_keys))
     
     # Calculate summary
     successful = len([r for r in results if r.get('status') == 'success'])
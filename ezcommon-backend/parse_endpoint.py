@@ -50,18 +50,17 @@ async def parse_document(
             detail=f"Unsupported file type: {file_ext}"
         )
     
-    # Save file temporarily
+    # Save file temporarily, copying 1 MiB at a time so the upload is
+    # never held in memory as a whole
     with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
+        while chunk := await file.read(1 << 20):
+            tmp_file.write(chunk)
+        file_size = tmp_file.tell()
         tmp_path = tmp_file.name
     
     try:
-        # Simulate processing time
-        time.sleep(0.5)
-        
         # Simulate chunk creation based on file size
-        file_size_kb = len(content) / 1024
+        file_size_kb = file_size / 1024
         chunks_created = max(1, int(file_size_kb / 10))  # 1 chunk per 10KB
         
         # Generate document ID
@@ -3,19 +3,79 @@ AI Text Editing API for Chrome Extension
 Follows the logic of server.js - uses LLM providers for intelligent text editing
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, Response, status, Depends
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+import asyncio
 import os
-import json
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any
 from services.llm_providers.factory import LLMFactory
+from services.school_form_output_service import migrate_flat_outputs, user_output_dir
 
 # Create router for easy integration
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Get the config/outputs directory
+# Outputs are stored per user: config/outputs/{user_id}/*.json
 CONFIG_OUTPUTS_DIR = Path(__file__).parent / "config" / "outputs"
+if CONFIG_OUTPUTS_DIR.exists():
+    migrate_flat_outputs(CONFIG_OUTPUTS_DIR)
+
+
+@lru_cache(maxsize=512)
+def _load_json(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parsed JSON file, cached until the file's mtime changes"""
+    return orjson.loads(Path(path).read_bytes())
+
+
+def _read_json(json_file: Path) -> Dict[str, Any]:
+    return _load_json(str(json_file), json_file.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=1024)
+def _school_response_bytes(path: str, mtime_ns: int) -> bytes:
+    """Serialized ProfileResponse body for one school file, per file version"""
+    return orjson.dumps({'success': True, 'data': _load_json(path, mtime_ns), 'error': None})
+
+
+# Parallel file reads when loading a user's outputs
+OUTPUT_LOAD_WORKERS = 16
+
+
+def _read_output(json_file: Path):
+    """(filename stem, data) for one output file, data is None if unreadable"""
+    try:
+        return json_file.stem, _read_json(json_file)
+    except Exception as e:
+        print(f"Error reading {json_file}: {e}")
+        return json_file.stem, None
+
+
+def _read_user_outputs(user_dir: Path) -> Dict[str, Any]:
+    """Load every JSON output in a user's directory, keyed by filename stem"""
+    if not user_dir.is_dir():
+        return {}
+    paths = list(user_dir.glob("*.json"))
+    if len(paths) <= 1:
+        results = map(_read_output, paths)
+    else:
+        with ThreadPoolExecutor(max_workers=min(OUTPUT_LOAD_WORKERS, len(paths))) as executor:
+            results = list(executor.map(_read_output, paths))
+    return {stem: data for stem, data in results if data is not None}
+
+
+def _user_dir(user_id: str) -> Path:
+    try:
+        return user_output_dir(CONFIG_OUTPUTS_DIR, user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid user_id"
+        )
 
 
 class AIEditRequest(BaseModel):
@@ -59,6 +119,24 @@ def initialize_llm_provider(provider_type: str = 'openai'):
         raise
 
 
+# Providers are created once per process and shared, so the SDK client and
+# its keep-alive connection pool are reused across requests
+_PROVIDERS: Dict[str, Any] = {}
+_PROVIDERS_LOCK = threading.Lock()
+
+
+def _get_provider(provider_type: str = 'openai'):
+    """Return the shared LLM provider, initializing it on first use"""
+    provider = _PROVIDERS.get(provider_type)
+    if provider is None:
+        with _PROVIDERS_LOCK:
+            provider = _PROVIDERS.get(provider_type)
+            if provider is None:
+                provider = initialize_llm_provider(provider_type)
+                _PROVIDERS[provider_type] = provider
+    return provider
+
+
 @router.post('/api/ai-edit')
 async def ai_edit(request_data: AIEditRequest):
     """
@@ -95,8 +173,9 @@ async def ai_edit(request_data: AIEditRequest):
             'model': model
         })
         
-        # Initialize LLM provider (defaults to openai like server.js)
-        llm_provider = initialize_llm_provider('openai')
+        # Shared LLM provider (defaults to openai like server.js); only the
+        # first request pays for initialization
+        llm_provider = _PROVIDERS.get('openai') or await asyncio.to_thread(_get_provider, 'openai')
         
         # Build the messages - matches server.js structure
         messages = [
@@ -110,8 +189,9 @@ async def ai_edit(request_data: AIEditRequest):
             }
         ]
         
-        # Call LLM provider to edit text
-        response = llm_provider.chat_completion(
+        # Call LLM provider to edit text (blocking HTTP call, run in a worker thread)
+        response = await asyncio.to_thread(
+            llm_provider.chat_completion,
             messages=messages,
             temperature=0.7
         )
@@ -152,19 +232,9 @@ async def get_user_profile(user_id: str):
     }
     """
     try:
-        user_data = {}
-        
-        # Find all JSON files for this user
-        if CONFIG_OUTPUTS_DIR.exists():
-            for json_file in CONFIG_OUTPUTS_DIR.glob(f"*{user_id}*.json"):
-                try:
-                    with open(json_file, 'r') as f:
-                        data = json.load(f)
-                        # Use filename as key (without extension)
-                        key = json_file.stem
-                        user_data[key] = data
-                except Exception as e:
-                    print(f"Error reading {json_file}: {e}")
+        # All JSON files for this user live in their own directory; read
+        # them concurrently off the event loop, keyed by filename (no extension)
+        user_data = await asyncio.to_thread(_read_user_outputs, _user_dir(user_id))
         
         if not user_data:
             raise HTTPException(
@@ -188,7 +258,7 @@ async def get_user_profile(user_id: str):
 
 
 @router.get('/api/profile/{user_id}/{school_id}')
-async def get_school_data(user_id: str, school_id: str):
+async def get_school_data(user_id: str, school_id: str, request: Request):
     """
     Get pre-filled data for a specific school
     
@@ -197,23 +267,30 @@ async def get_school_data(user_id: str, school_id: str):
         "success": true,
         "data": {...school form data...}
     }
+    
+    The body is served pre-serialized from memory while the file is
+    unchanged; clients sending If-None-Match with the returned ETag get a
+    304 instead.
     """
     try:
-        # Find the specific school file
-        pattern = f"*{user_id}*{school_id}*.json"
+        # Find the specific school file: the exact name first, then any
+        # file in the user's directory mentioning the school id
+        user_dir = _user_dir(user_id)
+        json_file = user_dir / f"filled_form_user_{user_id}_school_{school_id}.json"
+        if not json_file.is_file():
+            json_file = next(user_dir.glob(f"*{school_id}*.json"), None) if user_dir.is_dir() else None
         
-        if CONFIG_OUTPUTS_DIR.exists():
-            matching_files = list(CONFIG_OUTPUTS_DIR.glob(pattern))
-            
-            if matching_files:
-                json_file = matching_files[0]  # Get first match
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
-                
-                return ProfileResponse(
-                    success=True,
-                    data=data
-                )
+        if json_file is not None:
+            stat = json_file.stat()
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+            if request.headers.get('if-none-match') == etag:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(
+                content=_school_response_bytes(str(json_file), stat.st_mtime_ns),
+                media_type='application/json',
+                headers=headers
+            )
         
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
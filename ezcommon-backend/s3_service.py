@@ -2,11 +2,19 @@
 S3 Service for file uploads
 Handles uploading user files to AWS S3
 """
+import base64
+import binascii
+import io
 import os
+from functools import partial
+import threading
 import uuid
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, BinaryIO, Union
+from datetime import datetime, timezone
 import boto3
+from boto3.s3.transfer import TransferConfig
+from cachetools import TTLCache
 from botocore.exceptions import ClientError, EndpointConnectionError
 from aws_config import AWS_REGION, get_s3_client
 
@@ -14,24 +22,65 @@ from aws_config import AWS_REGION, get_s3_client
 S3_BUCKET_NAME = os.environ.get("S3_BUCKET_NAME", "ezcommon-uploads")
 S3_UPLOAD_PREFIX = os.environ.get("S3_UPLOAD_PREFIX", "user-uploads")
 
+# Multipart settings for streamed uploads
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+)
+
+# Parallel head_object calls when listing files uploaded before the
+# original filename was embedded in the key
+S3_HEAD_WORKERS = 16
+
+# Separates the uuid from the encoded original filename in object keys;
+# names whose encoding would exceed the limit are only kept in metadata
+KEY_FILENAME_SEPARATOR = "__"
+KEY_FILENAME_MAX_ENCODED = 512
+
+# Presigned URLs are reused for this long; a cached URL always has at least
+# (expiration - TTL) seconds of validity left when handed out
+PRESIGNED_URL_CACHE_TTL = int(os.environ.get("PRESIGNED_URL_CACHE_TTL", "300"))
+PRESIGNED_URL_CACHE_SIZE = int(os.environ.get("PRESIGNED_URL_CACHE_SIZE", "4096"))
+PRESIGNED_URL_MIN_VALIDITY = 60
+
+# OCR text of rendered pages is cached in the upload bucket under this
+# prefix (empty disables); a lifecycle rule expires it after the given days
+VISION_CACHE_PREFIX = os.environ.get("VISION_CACHE_PREFIX", "vision-cache")
+VISION_CACHE_EXPIRATION_DAYS = int(os.environ.get("VISION_CACHE_EXPIRATION_DAYS", "30"))
+VISION_CACHE_LIFECYCLE_RULE_ID = "expire-vision-cache"
+
 
 class S3Service:
     """Service for managing file uploads to S3"""
     
+    # Buckets already checked or created in this process
+    _BUCKET_READY: set = set()
+    
     def __init__(self):
         self.s3_client = get_s3_client()
         self.bucket_name = S3_BUCKET_NAME
         self.region = AWS_REGION
+        self._url_cache = TTLCache(maxsize=PRESIGNED_URL_CACHE_SIZE, ttl=PRESIGNED_URL_CACHE_TTL)
+        self._url_cache_lock = threading.Lock()
+        # Bound once instead of resolving the client method on every URL
+        self._presign_get_object = partial(self.s3_client.generate_presigned_url, 'get_object')
     
     def ensure_bucket_exists(self) -> bool:
         """
         Ensure the S3 bucket exists, create if it doesn't
         Returns True if bucket exists or was created successfully
+        
+        Only the first successful call per bucket and process reaches S3
         """
+        if self.bucket_name in self._BUCKET_READY:
+            return True
         try:
             # Check if bucket exists
             self.s3_client.head_bucket(Bucket=self.bucket_name)
             print(f"Bucket {self.bucket_name} already exists")
+            self._BUCKET_READY.add(self.bucket_name)
             return True
         except EndpointConnectionError as e:
             # Avoid crashing the app when S3 isn't reachable (e.g., offline/local dev)
@@ -73,6 +122,7 @@ class S3Service:
                     )
                     
                     print(f"Created bucket {self.bucket_name}")
+                    self._BUCKET_READY.add(self.bucket_name)
                     return True
                 except ClientError as create_error:
                     print(f"Error creating bucket: {create_error}")
@@ -85,9 +135,43 @@ class S3Service:
             print(f"Unexpected error checking bucket: {e}")
             return False
     
+    def ensure_vision_cache_expiration(self) -> bool:
+        """
+        Add (or update) the lifecycle rule that expires cached Vision OCR text
+        Other lifecycle rules on the bucket are kept as they are
+        """
+        if not VISION_CACHE_PREFIX:
+            return True
+        try:
+            try:
+                rules = self.s3_client.get_bucket_lifecycle_configuration(
+                    Bucket=self.bucket_name
+                )['Rules']
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'NoSuchLifecycleConfiguration':
+                    raise
+                rules = []
+            rules = [rule for rule in rules if rule.get('ID') != VISION_CACHE_LIFECYCLE_RULE_ID]
+            rules.append({
+                'ID': VISION_CACHE_LIFECYCLE_RULE_ID,
+                'Filter': {'Prefix': f"{VISION_CACHE_PREFIX}/"},
+                'Status': 'Enabled',
+                'Expiration': {'Days': VISION_CACHE_EXPIRATION_DAYS},
+                # The bucket is versioned; don't keep the expired copies around
+                'NoncurrentVersionExpiration': {'NoncurrentDays': 1},
+            })
+            self.s3_client.put_bucket_lifecycle_configuration(
+                Bucket=self.bucket_name,
+                LifecycleConfiguration={'Rules': rules}
+            )
+            return True
+        except ClientError as e:
+            print(f"Error setting vision cache lifecycle rule: {e}")
+            return False
+    
     def upload_file(
         self,
-        file_content: bytes,
+        file_content: Union[bytes, BinaryIO],
         filename: str,
         user_id: str,
         section: str,
@@ -97,7 +181,8 @@ class S3Service:
         Upload a file to S3
         
         Args:
-            file_content: File content as bytes
+            file_content: File content as bytes or a binary file-like object
+                (streamed to S3 without loading it into memory)
             filename: Original filename
             user_id: User ID for organizing files
             section: Section (profile, education, activity, testing)
@@ -106,34 +191,50 @@ class S3Service:
         Returns:
             Dict with file metadata including S3 key and URL
         """
-        # Generate unique filename to avoid collisions
+        # Generate unique filename to avoid collisions; the original name is
+        # embedded so listings don't need a head_object per file
         file_extension = os.path.splitext(filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
+        encoded_name = base64.urlsafe_b64encode(filename.encode()).decode()
+        if len(encoded_name) <= KEY_FILENAME_MAX_ENCODED:
+            unique_filename = f"{uuid.uuid4()}{KEY_FILENAME_SEPARATOR}{encoded_name}{file_extension}"
+        else:
+            unique_filename = f"{uuid.uuid4()}{file_extension}"
         
         # Construct S3 key: user-uploads/{user_id}/{section}/{unique_filename}
         s3_key = f"{S3_UPLOAD_PREFIX}/{user_id}/{section}/{unique_filename}"
         
+        if isinstance(file_content, (bytes, bytearray)):
+            fileobj = io.BytesIO(file_content)
+        else:
+            fileobj = file_content
+        fileobj.seek(0, io.SEEK_END)
+        size = fileobj.tell()
+        fileobj.seek(0)
+
         # Prepare upload parameters
-        upload_params = {
-            'Bucket': self.bucket_name,
-            'Key': s3_key,
-            'Body': file_content,
-        }
+        extra_args = {}
         
         if content_type:
-            upload_params['ContentType'] = content_type
+            extra_args['ContentType'] = content_type
         
-        # Add metadata
-        upload_params['Metadata'] = {
+        # Add metadata (one timestamp for the metadata and the response)
+        uploaded_at = datetime.now(timezone.utc).isoformat()
+        extra_args['Metadata'] = {
             'original_filename': filename,
             'user_id': user_id,
             'section': section,
-            'upload_timestamp': datetime.utcnow().isoformat()
+            'upload_timestamp': uploaded_at
         }
         
         try:
-            # Upload to S3
-            self.s3_client.put_object(**upload_params)
+            # Upload to S3 (multipart for large files)
+            self.s3_client.upload_fileobj(
+                fileobj,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs=extra_args,
+                Config=S3_TRANSFER_CONFIG,
+            )
             
             # Generate URL (presigned URL for private files, or public URL if bucket is public)
             file_url = self.generate_presigned_url(s3_key)
@@ -144,9 +245,9 @@ class S3Service:
                 'unique_filename': unique_filename,
                 's3_key': s3_key,
                 'url': file_url,
-                'size': len(file_content),
+                'size': size,
                 'section': section,
-                'uploaded_at': datetime.utcnow().isoformat()
+                'uploaded_at': uploaded_at
             }
         except ClientError as e:
             print(f"Error uploading file to S3: {e}")
@@ -167,15 +268,25 @@ class S3Service:
         Returns:
             Presigned URL string
         """
+        cacheable = expiration - PRESIGNED_URL_CACHE_TTL >= PRESIGNED_URL_MIN_VALIDITY
+        cache_key = (s3_key, expiration)
+        if cacheable:
+            with self._url_cache_lock:
+                url = self._url_cache.get(cache_key)
+            if url is not None:
+                return url
+        
         try:
-            url = self.s3_client.generate_presigned_url(
-                'get_object',
+            url = self._presign_get_object(
                 Params={
                     'Bucket': self.bucket_name,
                     'Key': s3_key
                 },
                 ExpiresIn=expiration
             )
+            if cacheable:
+                with self._url_cache_lock:
+                    self._url_cache[cache_key] = url
             return url
         except ClientError as e:
             print(f"Error generating presigned URL: {e}")
@@ -197,36 +308,76 @@ class S3Service:
             prefix += f"{section}/"
         
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
+            # Follow pagination past the 1000-key page limit
+            objects = [
+                obj
+                for page in self.s3_client.get_paginator('list_objects_v2').paginate(
+                    Bucket=self.bucket_name,
+                    Prefix=prefix
+                )
+                for obj in page.get('Contents', [])
+            ]
+            if not objects:
+                return []
             
-            files = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    # Get object metadata
-                    head_response = self.s3_client.head_object(
-                        Bucket=self.bucket_name,
-                        Key=obj['Key']
-                    )
-                    
-                    metadata = head_response.get('Metadata', {})
-                    
-                    files.append({
-                        'filename': metadata.get('original_filename', os.path.basename(obj['Key'])),
-                        's3_key': obj['Key'],
-                        'size': obj['Size'],
-                        'last_modified': obj['LastModified'].isoformat(),
-                        'url': self.generate_presigned_url(obj['Key']),
-                        'section': metadata.get('section', '')
-                    })
+            # Filename and section come from the key; only older keys without
+            # an embedded filename need a head_object, overlapped in threads
+            metadatas = [self._metadata_from_key(obj['Key']) for obj in objects]
+            missing = [i for i, metadata in enumerate(metadatas) if metadata is None]
+            if missing:
+                with ThreadPoolExecutor(max_workers=min(S3_HEAD_WORKERS, len(missing))) as executor:
+                    heads = executor.map(self._head_metadata, (objects[i]['Key'] for i in missing))
+                    for i, metadata in zip(missing, heads):
+                        metadatas[i] = metadata
             
-            return files
+            return [
+                {
+                    'filename': metadata.get('original_filename', os.path.basename(obj['Key'])),
+                    's3_key': obj['Key'],
+                    'size': obj['Size'],
+                    'last_modified': obj['LastModified'].isoformat(),
+                    'url': self.generate_presigned_url(obj['Key']),
+                    'section': metadata.get('section', '')
+                }
+                for obj, metadata in zip(objects, metadatas)
+            ]
         except ClientError as e:
             print(f"Error listing files: {e}")
             return []
     
+    @staticmethod
+    def _metadata_from_key(s3_key: str) -> Optional[Dict[str, str]]:
+        """
+        Original filename and section encoded in a key of the form
+        {prefix}/{user_id}/{section}/{uuid}__{base64 filename}{ext}
+        
+        Returns None for keys that don't carry the filename
+        """
+        parts = s3_key.split('/')
+        if len(parts) < 4:
+            return None
+        stem = os.path.splitext(parts[-1])[0]
+        _, sep, encoded_name = stem.partition(KEY_FILENAME_SEPARATOR)
+        if not sep:
+            return None
+        try:
+            filename = base64.urlsafe_b64decode(encoded_name).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            return None
+        return {'original_filename': filename, 'section': parts[-2]}
+    
+    def _head_metadata(self, s3_key: str) -> Dict[str, str]:
+        """User metadata of an object ({} if it vanished since it was listed)"""
+        try:
+            return self.s3_client.head_object(
+                Bucket=self.bucket_name,
+                Key=s3_key
+            ).get('Metadata', {})
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                return {}
+            raise
+    
     def delete_file(self, s3_key: str) -> bool:
         """
         Delete a file from S3
@@ -4,16 +4,152 @@ Integrates with S3, OpenSearch, and LLM providers for full document processing
 """
 import os
 import json
+import asyncio
 import boto3
 import tempfile
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from opensearchpy import OpenSearch, RequestsHttpConnection
 from requests_aws4auth import AWS4Auth
 import base64
+import hashlib
+import re
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from types import MappingProxyType
+from cachetools import TTLCache
+from aws_config import get_s3_client
+# OCR text is cached under VISION_CACHE_PREFIX, keyed by a hash of the page
+# image, prompt and model; init_s3.py sets up its expiration
+from s3_service import VISION_CACHE_PREFIX
+from .llm_providers import LLMProvider
 from .semantic_chunk_former import SemanticChunkFormer
 
+# File extension -> file type, image format and processor, shared by listing
+# and parsing
+IMAGE_FORMATS = MappingProxyType({
+    '.jpg': 'jpeg',
+    '.jpeg': 'jpeg',
+    '.png': 'png',
+    '.gif': 'gif',
+    '.webp': 'webp',
+})
+FILE_TYPES = MappingProxyType({'.pdf': 'pdf', **{ext: 'image' for ext in IMAGE_FORMATS}})
+PROCESSORS = MappingProxyType({'pdf': 'PyMuPDFProcessor', 'image': 'OpenAIVisionProcessor'})
+
+# Results of files already parsed, keyed by (user, key, ETag), so re-parsing
+# an unchanged object returns the stored result instead of redoing the work
+PARSE_RESULT_CACHE_TTL = int(os.environ.get("PARSE_RESULT_CACHE_TTL", str(24 * 3600)))
+PARSE_RESULT_CACHE_SIZE = int(os.environ.get("PARSE_RESULT_CACHE_SIZE", "1024"))
+
+# Concurrent Vision API calls when OCRing the pages of one PDF
+VISION_MAX_WORKERS = int(os.environ.get("VISION_MAX_WORKERS", "8"))
+
+# Threads used to presign download URLs for large file listings
+PRESIGN_WORKERS = 16
+PRESIGN_PARALLEL_MIN_FILES = 32
+
+# Text extraction of large PDFs is split across worker processes (0 or 1
+# disables); PDFs with fewer pages than the minimum stay in-process
+PDF_EXTRACT_PROCESSES = int(os.environ.get("PDF_EXTRACT_PROCESSES", str(min(os.cpu_count() or 1, 4))))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "64"))
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all PDF extractions, created on first use"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        with _pdf_pool_lock:
+            if _pdf_pool is None:
+                # spawn: forking a process that runs threads can deadlock
+                _pdf_pool = ProcessPoolExecutor(
+                    max_workers=PDF_EXTRACT_PROCESSES,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pdf_pool
+
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next _get_pdf_pool() call builds a new one"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_texts_parallel(source: Union[str, bytes], num_pages: int) -> List[str]:
+    """Text of every page, one contiguous page range per pool worker
+
+    A worker crash (e.g. MuPDF segfaulting on a malformed file) breaks the
+    whole pool; it is replaced and the extraction retried once before
+    BrokenProcessPool is raised to the caller.
+    """
+    step = -(-num_pages // PDF_EXTRACT_PROCESSES)
+    ranges = [(start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+    for attempt in range(2):
+        pool = _get_pdf_pool()
+        try:
+            futures = [pool.submit(_extract_page_texts, source, start, stop) for start, stop in ranges]
+            return [text for future in futures for text in future.result()]
+        except BrokenProcessPool:
+            _discard_pdf_pool(pool)
+            if attempt:
+                raise
+            print("⚠ PDF extraction pool broke, recreating it and retrying...")
+
+
+def _open_pdf(source: Union[str, bytes]):
+    """Open a PDF from a path or from its bytes with PyMuPDF"""
+    import fitz  # PyMuPDF
+
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def _extract_page_texts(source: Union[str, bytes], start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of a PDF (runs in a worker process)"""
+    with _open_pdf(source) as doc:
+        return [doc[page_num].get_text("text") for page_num in range(start, stop)]
+
+
+OCR_PAGE_PROMPT = """Extract all text from this document image.
+
+Please return the text exactly as it appears, maintaining the original structure and formatting.
+If the document contains Chinese text, please extract it accurately.
+If there are tables, lists, or structured data, preserve their format."""
+
+# Scanned pages are rendered at OCR_DPI and sent as JPEG, which is far smaller
+# than PNG for scans; pages that come back blank are retried once at
+# OCR_RETRY_DPI
+OCR_DPI = int(os.environ.get("OCR_DPI", "150"))
+OCR_RETRY_DPI = int(os.environ.get("OCR_RETRY_DPI", "250"))
+OCR_JPEG_QUALITY = 85
+OCR_MEDIA_TYPE = "image/jpeg"
+
+# Pages sent together in one Vision request (1 disables grouping); providers
+# without multi-image support are sent one page per request
+OCR_PAGES_PER_REQUEST = int(os.environ.get("OCR_PAGES_PER_REQUEST", "3"))
+
+OCR_MULTI_PAGE_PROMPT = """These images are pages {pages} of one document, in order.
+
+Extract all text from every page. Begin each page with a line of the form
+--- Page N ---
+using the page numbers {pages}, then the page's text exactly as it appears,
+maintaining the original structure and formatting.
+If the document contains Chinese text, please extract it accurately.
+If there are tables, lists, or structured data, preserve their format."""
+
+_PAGE_MARKER_RE = re.compile(r"^[ \t]*-{3}\s*Page\s+(\d+)\s*-{3}[ \t]*$", re.MULTILINE)
+
 
 class DocumentParseService:
     """Complete document parsing service with S3, OpenSearch, and LLM integration"""
@@ -39,8 +175,12 @@ class DocumentParseService:
         # Initialize semantic chunk former
         self.semantic_chunk_former = SemanticChunkFormer(llm_provider) if llm_provider else None
 
-        # Initialize S3 client
-        self.s3_client = boto3.client('s3', region_name=self.aws_region)
+        # Shared S3 client: one session, pooled keep-alive connections and
+        # cached credentials/signer across listing, presigning and downloads
+        self.s3_client = get_s3_client()
+        
+        self._parsed = TTLCache(maxsize=PARSE_RESULT_CACHE_SIZE, ttl=PARSE_RESULT_CACHE_TTL)
+        self._parsed_lock = threading.Lock()
         
         # Legacy OpenSearch support (if search_provider not used)
         if not search_provider:
@@ -88,13 +228,16 @@ class DocumentParseService:
             print("  Service will continue without OpenSearch storage")
             return None
     
-    def list_user_files(self, user_id: str, section: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_user_files(self, user_id: str, section: Optional[str] = None,
+                        include_urls: bool = True) -> List[Dict[str, Any]]:
         """
         List all files uploaded by a user from S3
         
         Args:
             user_id: User ID
             section: Optional section filter (education, activity, testing, profile)
+            include_urls: Presign a download URL per file; when False 'url'
+                is None and callers presign only the files they need
             
         Returns:
             List of file information dictionaries
@@ -104,14 +247,16 @@ class DocumentParseService:
             prefix += f"{section}/"
         
         try:
-            response = self.s3_client.list_objects_v2(
+            # Follow pagination past the 1000-key page limit
+            pages = self.s3_client.get_paginator('list_objects_v2').paginate(
                 Bucket=self.s3_bucket,
-                Prefix=prefix
+                Prefix=prefix,
+                PaginationConfig={'PageSize': 1000}
             )
             
             files = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
+            for page in pages:
+                for obj in page.get('Contents', []):
                     # Skip directory markers
                     if obj['Key'].endswith('/'):
                         continue
@@ -122,13 +267,7 @@ class DocumentParseService:
                     filename = key_parts[-1]
                     
                     # Determine file type
-                    file_ext = Path(filename).suffix.lower()
-                    if file_ext == '.pdf':
-                        file_type = 'pdf'
-                    elif file_ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-                        file_type = 'image'
-                    else:
-                        file_type = 'other'
+                    file_type = FILE_TYPES.get(Path(filename).suffix.lower(), 'other')
                     
                     files.append({
                         'key': obj['Key'],
@@ -137,9 +276,19 @@ class DocumentParseService:
                         'file_type': file_type,
                         'size': obj['Size'],
                         'last_modified': obj['LastModified'].isoformat(),
-                        'url': self._generate_presigned_url(obj['Key'])
+                        'url': None
                     })
             
+            if include_urls and files:
+                keys = [file_info['key'] for file_info in files]
+                if len(keys) >= PRESIGN_PARALLEL_MIN_FILES:
+                    with ThreadPoolExecutor(max_workers=PRESIGN_WORKERS) as executor:
+                        urls = list(executor.map(self._generate_presigned_url, keys))
+                else:
+                    urls = [self._generate_presigned_url(key) for key in keys]
+                for file_info, url in zip(files, urls):
+                    file_info['url'] = url
+            
             return files
         except Exception as e:
             print(f"Error listing files: {e}")
@@ -176,29 +325,45 @@ class DocumentParseService:
             self.s3_client.download_fileobj(self.s3_bucket, s3_key, tmp_file)
             return tmp_file.name
     
-    def process_pdf(self, file_path: str) -> str:
+    def get_s3_bytes(self, s3_key: str, etag: Optional[str] = None) -> bytes:
         """
-        Extract text from PDF using PyPDF2 first, then OCR if needed
+        Read an S3 object into memory
+        
+        Args:
+            s3_key: S3 object key
+            etag: If given, fail unless the object still has this ETag
+            
+        Returns:
+            Object contents
+        """
+        kwargs = {'IfMatch': etag} if etag else {}
+        response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=s3_key, **kwargs)
+        return response['Body'].read()
+    
+    def process_pdf(self, file_path: Union[str, bytes]) -> str:
+        """
+        Extract text from PDF using PyMuPDF first, then OCR if needed
 
         Args:
-            file_path: Path to PDF file
+            file_path: Path to PDF file, or the PDF's bytes
 
         Returns:
             Extracted text
         """
         try:
-            import PyPDF2
+            with _open_pdf(file_path) as doc:
+                num_pages = doc.page_count
 
-            text_parts = []
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    if text.strip():
-                        text_parts.append(f"--- Page {page_num + 1} ---\n{text}")
+            if PDF_EXTRACT_PROCESSES > 1 and num_pages >= PDF_PARALLEL_MIN_PAGES:
+                page_texts = _extract_page_texts_parallel(file_path, num_pages)
+            else:
+                page_texts = _extract_page_texts(file_path, 0, num_pages)
 
-            extracted_text = "\n\n".join(text_parts)
+            extracted_text = "\n\n".join(
+                f"--- Page {page_num} ---\n{text}"
+                for page_num, text in enumerate(page_texts, start=1)
+                if text.strip()
+            )
 
             # If no text extracted or very little text, try OCR
             if not extracted_text.strip() or len(extracted_text.strip()) < 50:
@@ -206,72 +371,202 @@ class DocumentParseService:
                 extracted_text = self._process_pdf_with_ocr(file_path)
 
             return extracted_text
+        except BrokenProcessPool as e:
+            # A crashing extraction worker is not a reason to bill Vision OCR
+            raise RuntimeError(f"PDF processing failed: extraction worker crashed: {e}")
         except Exception as e:
-            # If PyPDF2 fails, try OCR as fallback
-            print(f"PyPDF2 failed: {e}, trying OCR...")
+            # If PyMuPDF fails, try OCR as fallback
+            print(f"PyMuPDF failed: {e}, trying OCR...")
             try:
                 return self._process_pdf_with_ocr(file_path)
             except Exception as ocr_error:
-                raise RuntimeError(f"PDF processing failed: PyPDF2 error: {str(e)}, OCR error: {str(ocr_error)}")
+                raise RuntimeError(f"PDF processing failed: PyMuPDF error: {str(e)}, OCR error: {str(ocr_error)}")
 
-    def _process_pdf_with_ocr(self, file_path: str) -> str:
+    def _process_pdf_with_ocr(self, file_path: Union[str, bytes]) -> str:
         """
         Extract text from PDF using OpenAI Vision API (for scanned PDFs or images)
 
         Args:
-            file_path: Path to PDF file
+            file_path: Path to PDF file, or the PDF's bytes
 
         Returns:
             Extracted text via Vision API
         """
         try:
-            from pdf2image import convert_from_path
+            from pdf2image import convert_from_bytes, convert_from_path
+
+            if not self.llm_provider:
+                raise RuntimeError("LLM provider not initialized")
 
             # Convert PDF to images
             print(f"Converting PDF to images for Vision API processing...")
-            images = convert_from_path(file_path, dpi=200)  # Lower DPI for faster processing
+            convert = convert_from_bytes if isinstance(file_path, (bytes, bytearray)) else convert_from_path
+            render_threads = min(os.cpu_count() or 1, 4)
+            # Rendered losslessly (ppm); _encode_page does the one JPEG encode
+            images = convert(file_path, dpi=OCR_DPI, thread_count=render_threads)
+            if not images:
+                return ""
 
-            text_parts = []
-            for page_num, image in enumerate(images, start=1):
-                print(f"Vision API processing page {page_num}/{len(images)}...")
+            # Pages are independent; send small groups of them to the Vision
+            # API concurrently and reassemble in page order
+            page_count = len(images)
+            # Providers without multi-image support get one page per request,
+            # so every page keeps its own slot in the pool
+            supports_multi = (
+                type(self.llm_provider).vision_analysis_multi
+                is not LLMProvider.vision_analysis_multi
+            )
+            group_size = max(1, OCR_PAGES_PER_REQUEST) if supports_multi else 1
+            groups = [
+                list(enumerate(images[start:start + group_size], start=start + 1))
+                for start in range(0, page_count, group_size)
+            ]
+            with ThreadPoolExecutor(max_workers=min(VISION_MAX_WORKERS, len(groups))) as executor:
+                results = [
+                    text
+                    for group_texts in executor.map(lambda group: self._ocr_page_group(group, page_count), groups)
+                    for text in group_texts
+                ]
 
-                # Convert PIL Image to base64
-                import io
-                buffer = io.BytesIO()
-                image.save(buffer, format='PNG')
-                image_bytes = buffer.getvalue()
-                image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+            # Re-render pages that came back blank at a higher resolution
+            for page_num, text in enumerate(results, start=1):
+                if text is not None and not text.strip():
+                    print(f"Page {page_num} came back blank, retrying at {OCR_RETRY_DPI} dpi...")
+                    retry_image = convert(
+                        file_path, dpi=OCR_RETRY_DPI,
+                        first_page=page_num, last_page=page_num
+                    )[0]
+                    results[page_num - 1] = self._ocr_page(page_num, self._encode_page(retry_image), page_count)
 
-                # Call LLM Vision API
-                prompt = """Extract all text from this document image.
+            if all(text is None for text in results):
+                raise RuntimeError("Vision API failed on every page")
 
-Please return the text exactly as it appears, maintaining the original structure and formatting.
-If the document contains Chinese text, please extract it accurately.
-If there are tables, lists, or structured data, preserve their format."""
+            return "\n\n".join(
+                f"--- Page {page_num} ---\n{text}"
+                for page_num, text in enumerate(results, start=1)
+                if text and text.strip()
+            )
+        except Exception as e:
+            raise RuntimeError(f"Vision API processing failed: {str(e)}")
+
+    @staticmethod
+    def _encode_page(image) -> str:
+        """JPEG-encode a rendered page as base64"""
+        import io
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=OCR_JPEG_QUALITY, optimize=True)
+        return base64.b64encode(buffer.getvalue()).decode('utf-8')
 
-                if not self.llm_provider:
-                    raise RuntimeError("LLM provider not initialized")
+    def _ocr_page_group(self, group: List[tuple], page_count: int) -> List[Optional[str]]:
+        """
+        OCR (page_num, image) pages, reusing cached text and sending the
+        rest in one multi-image request
+
+        Falls back to one request per page if the provider can't take
+        several images or the reply doesn't mark every page.
+        """
+        pages = [(page_num, self._encode_page(image)) for page_num, image in group]
+        texts = {page_num: self._vision_cache_get(image_base64) for page_num, image_base64 in pages}
+        pending = [(page_num, image_base64) for page_num, image_base64 in pages if texts[page_num] is None]
 
-                # Use llm_provider's vision_analysis method
-                response = self.llm_provider.vision_analysis(
-                    image_base64=image_base64,
-                    prompt=prompt
+        if len(pending) > 1:
+            page_nums = [page_num for page_num, _ in pending]
+            label = ", ".join(map(str, page_nums))
+            print(f"Vision API processing pages {label}/{page_count}...")
+            try:
+                response = self.llm_provider.vision_analysis_multi(
+                    images_base64=[image_base64 for _, image_base64 in pending],
+                    prompt=OCR_MULTI_PAGE_PROMPT.format(pages=label),
+                    media_type=OCR_MEDIA_TYPE
                 )
+                split = self._split_pages(response['content'], page_nums)
+                if split is not None:
+                    for (page_num, image_base64), text in zip(pending, split):
+                        texts[page_num] = text
+                        self._vision_cache_put(image_base64, text)
+                    pending = []
+                else:
+                    print(f"⚠ Pages {label} came back without page markers, retrying one by one")
+            except NotImplementedError:
+                pass
+            except Exception as e:
+                print(f"⚠ Vision API failed on pages {label}: {e}, retrying one by one")
+
+        for page_num, image_base64 in pending:
+            texts[page_num] = self._ocr_page(page_num, image_base64, page_count)
+        return [texts[page_num] for page_num, _ in pages]
 
-                text = response['content']
-                if text.strip():
-                    text_parts.append(f"--- Page {page_num} ---\n{text}")
+    @staticmethod
+    def _split_pages(content: str, page_nums: List[int]) -> Optional[List[str]]:
+        """Split a multi-page reply on its page markers; None unless each page appears once, in order"""
+        markers = list(_PAGE_MARKER_RE.finditer(content))
+        if [int(marker.group(1)) for marker in markers] != page_nums:
+            return None
+        ends = [marker.start() for marker in markers[1:]] + [len(content)]
+        return [content[marker.end():end].strip() for marker, end in zip(markers, ends)]
+
+    def _ocr_page(self, page_num: int, image_base64: str, page_count: int) -> Optional[str]:
+        """OCR one rendered PDF page; returns None if the Vision call failed"""
+        print(f"Vision API processing page {page_num}/{page_count}...")
 
-            return "\n\n".join(text_parts)
+        try:
+            # Use llm_provider's vision_analysis method
+            response = self.llm_provider.vision_analysis(
+                image_base64=image_base64,
+                prompt=OCR_PAGE_PROMPT,
+                media_type=OCR_MEDIA_TYPE
+            )
         except Exception as e:
-            raise RuntimeError(f"Vision API processing failed: {str(e)}")
+            print(f"⚠ Vision API failed on page {page_num}: {e}")
+            return None
+        self._vision_cache_put(image_base64, response['content'])
+        return response['content']
+
+    def _vision_cache_key(self, image_base64: str) -> str:
+        """S3 key of the cached OCR text for a page image"""
+        digest = hashlib.sha256()
+        digest.update(image_base64.encode())
+        digest.update(OCR_PAGE_PROMPT.encode())
+        digest.update(type(self.llm_provider).__name__.encode())
+        digest.update(str(getattr(self.llm_provider, 'vision_model', '')).encode())
+        return f"{VISION_CACHE_PREFIX}/{digest.hexdigest()}.txt"
+
+    def _vision_cache_get(self, image_base64: str) -> Optional[str]:
+        """Cached OCR text for a page image, None on a miss"""
+        if not VISION_CACHE_PREFIX:
+            return None
+        try:
+            response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=self._vision_cache_key(image_base64))
+            return response['Body'].read().decode('utf-8')
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            print(f"⚠ Vision cache read failed: {e}")
+            return None
+
+    def _vision_cache_put(self, image_base64: str, text: str) -> None:
+        """Store OCR text for a page image; failures only cost a future cache miss"""
+        if not VISION_CACHE_PREFIX or text is None:
+            return
+        try:
+            self.s3_client.put_object(
+                Bucket=self.s3_bucket,
+                Key=self._vision_cache_key(image_base64),
+                Body=text.encode('utf-8'),
+                ContentType='text/plain; charset=utf-8'
+            )
+        except Exception as e:
+            print(f"⚠ Vision cache write failed: {e}")
     
-    def process_image(self, file_path: str, source_file: str = None) -> Dict[str, Any]:
+    def process_image(self, file_path: Union[str, bytes], source_file: str = None) -> Dict[str, Any]:
         """
         Extract information from image using OpenAI GPT-4 Vision
 
         Args:
-            file_path: Path to image file
+            file_path: Path to image file, or the image's bytes (the format
+                is then taken from source_file)
             source_file: Optional source filename to include in metadata
 
         Returns:
@@ -279,21 +574,18 @@ If there are tables, lists, or structured data, preserve their format."""
         """
         try:
             # Read image file and encode to base64
-            with open(file_path, 'rb') as image_file:
-                image_bytes = image_file.read()
+            if isinstance(file_path, (bytes, bytearray)):
+                image_bytes = file_path
+                file_ext = Path(source_file or '').suffix.lower()
+            else:
+                with open(file_path, 'rb') as image_file:
+                    image_bytes = image_file.read()
+                file_ext = Path(file_path).suffix.lower()
 
             image_base64 = base64.b64encode(image_bytes).decode('utf-8')
 
             # Determine image format
-            file_ext = Path(file_path).suffix.lower()
-            format_map = {
-                '.jpg': 'jpeg',
-                '.jpeg': 'jpeg',
-                '.png': 'png',
-                '.gif': 'gif',
-                '.webp': 'webp'
-            }
-            image_format = format_map.get(file_ext, 'jpeg')
+            image_format = IMAGE_FORMATS.get(file_ext, 'jpeg')
 
             # Call OpenAI GPT-4 Vision
             prompt = """Analyze this document image and extract all relevant information.
@@ -317,7 +609,8 @@ Extract as much structured information as possible. Be thorough and accurate."""
             # Use llm_provider's vision_analysis method
             response = self.llm_provider.vision_analysis(
                 image_base64=image_base64,
-                prompt=prompt
+                prompt=prompt,
+                media_type=f"image/{image_format}"
             )
 
             # Parse response
@@ -411,15 +704,21 @@ Extract as much structured information as possible. Be thorough and accurate."""
         
         # Split text into sentences for better chunk boundaries
         sentences = text.split('. ')
-        current_chunk = ""
+        last_index = len(sentences) - 1
+        # The current chunk is kept as a list of parts joined with spaces
+        # only when it is saved, so building it never re-copies the text
+        parts: List[str] = []
+        length = 0              # len(" ".join(parts))
+        has_content = False     # " ".join(parts).strip() is non-empty
         chunk_index = 0
         has_overlap = False  # Track if current chunk contains overlap
         
         for i, sentence in enumerate(sentences):
-            sentence = sentence.strip() + ('.' if i < len(sentences) - 1 else '')
+            sentence = sentence.strip() + ('.' if i < last_index else '')
             
             # Check if adding this sentence would exceed chunk size
-            if len(current_chunk) + len(sentence) + 1 > CHUNK_SIZE and current_chunk.strip():
+            if length + len(sentence) + 1 > CHUNK_SIZE and has_content:
+                current_chunk = " ".join(parts)
                 # Save current chunk
                 chunk = {
                     "text": current_chunk.strip(),
@@ -440,13 +739,22 @@ Extract as much structured information as possible. Be thorough and accurate."""
                 # Start new chunk with overlap from previous chunk
                 # Include last OVERLAP characters from previous chunk for context
                 overlap_text = current_chunk[-OVERLAP:] if len(current_chunk) > OVERLAP else current_chunk
-                current_chunk = overlap_text + " " + sentence
+                parts = [overlap_text, sentence]
+                length = len(overlap_text) + 1 + len(sentence)
+                has_content = bool(overlap_text.strip() or sentence.strip())
                 has_overlap = True  # Next chunk will have overlap
                 chunk_index += 1
+            elif length:
+                parts.append(sentence)
+                length += 1 + len(sentence)
+                has_content = has_content or bool(sentence.strip())
             else:
-                current_chunk += " " + sentence if current_chunk else sentence
+                parts = [sentence]
+                length = len(sentence)
+                has_content = bool(sentence.strip())
         
         # Don't forget the last chunk
+        current_chunk = " ".join(parts)
         if current_chunk.strip():
             chunk = {
                 "text": current_chunk.strip(),
@@ -507,6 +815,10 @@ Extract as much structured information as possible. Be thorough and accurate."""
 
         if not self.opensearch_client.indices.exists(index=self.index_name):
             index_body = {
+                "settings": {
+                    "refresh_interval": os.environ.get('OPENSEARCH_REFRESH_INTERVAL', '1s'),
+                    "translog": {"flush_threshold_size": "1gb"}
+                },
                 "mappings": {
                     "properties": {
                         "document_id": {"type": "keyword"},
@@ -567,6 +879,20 @@ Extract as much structured information as possible. Be thorough and accurate."""
             print("  Continuing with raw chunks")
             return []
 
+    async def aprocess_file_from_s3(self, s3_key: str, user_id: str, progress_callback=None,
+                                    executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        Awaitable process_file_from_s3 for async callers
+
+        The pipeline runs on executor (the loop's default pool if None), so
+        the event loop stays free while the download, extraction and LLM
+        calls block; pages and files are already overlapped inside it.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, partial(self.process_file_from_s3, s3_key, user_id, progress_callback)
+        )
+
     def process_file_from_s3(self, s3_key: str, user_id: str, progress_callback=None) -> Dict[str, Any]:
         """
         Process a file from S3
@@ -592,105 +918,125 @@ Extract as much structured information as possible. Be thorough and accurate."""
 
         # Determine file type
         file_ext = Path(filename).suffix.lower()
-        if file_ext == '.pdf':
-            file_type = 'pdf'
-            processor_name = 'PyPDF2Processor'
-        elif file_ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-            file_type = 'image'
-            processor_name = 'OpenAIVisionProcessor'
-        else:
+        file_type = FILE_TYPES.get(file_ext)
+        if file_type is None:
             raise ValueError(f"Unsupported file type: {file_ext}")
+        processor_name = PROCESSORS[file_type]
 
-        # Download file from S3
+        # Skip the work if this exact object version was already parsed
+        etag = self.s3_client.head_object(Bucket=self.s3_bucket, Key=s3_key)['ETag']
+        parsed_key = (user_id, s3_key, etag)
+        with self._parsed_lock:
+            previous = self._parsed.get(parsed_key)
+        if previous is not None:
+            report_progress(100, f"{filename} unchanged since last parse, reusing result")
+            return self._copy_result(previous)
+
+        # Read the file from S3 straight into memory (pinned to the ETag
+        # checked above)
         report_progress(10, f"Downloading {filename} from S3...")
-        local_path = self.download_from_s3(s3_key)
+        file_bytes = self.get_s3_bytes(s3_key, etag)
 
-        try:
-            # Process based on file type
-            report_progress(25, f"Analyzing document structure...")
-
-            if file_type == 'pdf':
-                # Extract text from PDF
-                report_progress(40, "Extracting text from PDF...")
-                extracted_text = self.process_pdf(local_path)
-            elif file_type == 'image':
-                # Extract information from image using Vision API
-                report_progress(40, "Processing image with AI Vision...")
-                # process_image returns: {"information_chunks": [{"text": "...", "category": "...", "chunk_type": "...", "source_files": [...]}]}
-                structured_data = self.process_image(local_path, source_file=filename)
-                # Convert structured data to readable text format for semantic chunking
-                # Avoid using json.dumps with indentation to prevent JSON parsing issues
-                # when this content is embedded in the LLM response JSON
-                extracted_text = self._format_structured_data_as_text(structured_data)
-            else:
-                raise ValueError(f"Unsupported file type: {file_ext}")
+        # Process based on file type
+        report_progress(25, f"Analyzing document structure...")
 
-            if not extracted_text.strip():
-                raise RuntimeError("No text could be extracted from the document")
+        if file_type == 'pdf':
+            # Extract text from PDF
+            report_progress(40, "Extracting text from PDF...")
+            extracted_text = self.process_pdf(file_bytes)
+        elif file_type == 'image':
+            # Extract information from image using Vision API
+            report_progress(40, "Processing image with AI Vision...")
+            # process_image returns: {"information_chunks": [{"text": "...", "category": "...", "chunk_type": "...", "source_files": [...]}]}
+            structured_data = self.process_image(file_bytes, source_file=filename)
+            # Convert structured data to readable text format for semantic chunking
+            # Avoid using json.dumps with indentation to prevent JSON parsing issues
+            # when this content is embedded in the LLM response JSON
+            extracted_text = self._format_structured_data_as_text(structured_data)
+        else:
+            raise ValueError(f"Unsupported file type: {file_ext}")
 
-            report_progress(60, "Forming semantic blocks from extracted content...")
-            
-            # NEW: Send raw extracted text directly to semantic chunking (no pre-chunking!)
-            # This preserves all context for the LLM to make better decisions
-            raw_texts = [{
-                'source_file': filename,
-                'file_type': file_type,
-                'content': extracted_text
-            }]
-            
-            # Form semantic chunks from this file
-            semantic_blocks = self.form_semantic_chunks_for_user(user_id, section, raw_texts)
-            
-            # Use semantic blocks if available, otherwise fall back to raw text chunks
-            if semantic_blocks:
-                print(f"  ✓ Formed {len(semantic_blocks)} semantic blocks from extracted content")
-                # Store semantic blocks
-                document_id = self._generate_document_id(filename, user_id)
-                for block in semantic_blocks:
-                    if self.search_provider:
-                        self.search_provider.store_document(block['block_id'], block)
-                chunks_to_return = semantic_blocks
-            else:
-                print(f"  ⚠ Semantic chunking failed, creating fallback text chunks")
-                # Fallback: create naive chunks from extracted text
-                document_id = self._generate_document_id(filename, user_id)
-                fallback_chunks = self._create_text_chunks(extracted_text, source_file=filename)
-                # Store fallback chunks in search provider (ChromaDB/OpenSearch)
-                self._store_document_chunks(
-                    document_id=document_id,
-                    source_file=filename,
-                    chunks=fallback_chunks,
-                    processor_name=processor_name,
-                    file_type=file_type,
-                    user_id=user_id,
-                    section=section
+        if not extracted_text.strip():
+            raise RuntimeError("No text could be extracted from the document")
+
+        report_progress(60, "Forming semantic blocks from extracted content...")
+
+        # NEW: Send raw extracted text directly to semantic chunking (no pre-chunking!)
+        # This preserves all context for the LLM to make better decisions
+        raw_texts = [{
+            'source_file': filename,
+            'file_type': file_type,
+            'content': extracted_text
+        }]
+
+        # Form semantic chunks from this file
+        semantic_blocks = self.form_semantic_chunks_for_user(user_id, section, raw_texts)
+
+        # Use semantic blocks if available, otherwise fall back to raw text chunks
+        if semantic_blocks:
+            print(f"  ✓ Formed {len(semantic_blocks)} semantic blocks from extracted content")
+            # Store semantic blocks in one batched write
+            document_id = self._generate_document_id(filename, user_id)
+            if self.search_provider:
+                self.search_provider.store_documents(
+                    [(block['block_id'], block) for block in semantic_blocks]
                 )
-                chunks_to_return = fallback_chunks
-
-            report_progress(95, "Finalizing...")
-            print(f"  ✓ Processing complete for {filename}")
-            if semantic_blocks:
-                print(f"  Document ID: {document_id} ({len(semantic_blocks)} semantic blocks)")
-
-            report_progress(100, "Processing complete!")
-
-            return {
-                "status": "success",
-                "document_id": document_id,
-                "source_file": filename,
-                "s3_key": s3_key,
-                "section": section,
-                "file_type": file_type,
-                "chunks_created": len(chunks_to_return),
-                "chunks": chunks_to_return,
-                "processor_used": processor_name,
-                "used_semantic_chunking": bool(semantic_blocks)
-            }
+            chunks_to_return = semantic_blocks
+        else:
+            print(f"  ⚠ Semantic chunking failed, creating fallback text chunks")
+            # Fallback: create naive chunks from extracted text
+            document_id = self._generate_document_id(filename, user_id)
+            fallback_chunks = self._create_text_chunks(extracted_text, source_file=filename)
+            # Store fallback chunks in search provider (ChromaDB/OpenSearch)
+            self._store_document_chunks(
+                document_id=document_id,
+                source_file=filename,
+                chunks=fallback_chunks,
+                processor_name=processor_name,
+                file_type=file_type,
+                user_id=user_id,
+                section=section
+            )
+            chunks_to_return = fallback_chunks
 
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(local_path)
-            except:
-                pass
+        report_progress(95, "Finalizing...")
+        print(f"  ✓ Processing complete for {filename}")
+        if semantic_blocks:
+            print(f"  Document ID: {document_id} ({len(semantic_blocks)} semantic blocks)")
+
+        report_progress(100, "Processing complete!")
 
+        result = {
+            "status": "success",
+            "document_id": document_id,
+            "source_file": filename,
+            "s3_key": s3_key,
+            "section": section,
+            "file_type": file_type,
+            "chunks_created": len(chunks_to_return),
+            "chunks": chunks_to_return,
+            "processor_used": processor_name,
+            "used_semantic_chunking": bool(semantic_blocks)
+        }
+        with self._parsed_lock:
+            self._parsed[parsed_key] = self._copy_result(result)
+        return result
+
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a parse result so callers never mutate the cached entry"""
+        return {**result, "chunks": list(result.get("chunks", []))}
+
+    def forget_parsed(self, user_id: str, s3_key: Optional[str] = None) -> None:
+        """Drop cached parse results for a user (or one of their files)
+
+        Called when a file or the user's indexed documents are deleted, so the
+        next parse re-indexes instead of reporting the stale result.
+        """
+        with self._parsed_lock:
+            stale = [
+                key for key in self._parsed
+                if key[0] == user_id and (s3_key is None or key[1] == s3_key)
+            ]
+            for key in stale:
+                self._parsed.pop(key, None)
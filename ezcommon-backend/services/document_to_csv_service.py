@@ -4,13 +4,23 @@ Service for generating CSV files from parsed documents stored in OpenSearch
 import os
 import csv
 import io
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
 from datetime import datetime
 from opensearchpy import OpenSearch, RequestsHttpConnection
 from requests_aws4auth import AWS4Auth
 import boto3
 
 
+SUMMARY_CSV_HEADER = (
+    'Source File', 'File Type', 'Section', 'Category',
+    'Chunk Type', 'Content', 'Extraction Date',
+)
+CATEGORIZED_CSV_HEADER = ('Category', 'Information', 'Source File', 'Section')
+
+# Flush streamed CSV output once this many characters are buffered
+CSV_STREAM_FLUSH_SIZE = 64 * 1024
+
+
 class DocumentToCSVService:
     """Service for converting parsed documents to CSV format"""
     
@@ -101,30 +111,58 @@ class DocumentToCSVService:
         Returns:
             List of structured data rows for CSV
         """
-        rows = []
-        
+        return [dict(zip(SUMMARY_CSV_HEADER, row)) for row in self.iter_summary_rows(documents)]
+
+    def iter_summary_rows(self, documents: List[Dict[str, Any]]) -> Iterator[Tuple]:
+        """Yield one SUMMARY_CSV_HEADER-ordered row per document chunk"""
         for doc in documents:
             source_file = doc.get('source_file', 'Unknown')
             file_type = doc.get('file_type', 'Unknown')
             section = doc.get('section', 'Unknown')
             extraction_timestamp = doc.get('extraction_timestamp', '')
             
-            # Get information chunks
-            chunks = doc.get('information_chunks', [])
+            for chunk in doc.get('information_chunks', []):
+                yield (
+                    source_file,
+                    file_type,
+                    section,
+                    chunk.get('category', ''),
+                    chunk.get('chunk_type', ''),
+                    chunk.get('text', ''),
+                    extraction_timestamp,
+                )
+
+    def iter_categorized_rows(self, documents: List[Dict[str, Any]]) -> Iterator[Tuple]:
+        """Yield CATEGORIZED_CSV_HEADER-ordered rows grouped by category"""
+        category_data: Dict[str, List[Tuple]] = {}
+        
+        for doc in documents:
+            source_file = doc.get('source_file', 'Unknown')
+            section_name = doc.get('section', 'Unknown')
             
-            for chunk in chunks:
-                row = {
-                    'Source File': source_file,
-                    'File Type': file_type,
-                    'Section': section,
-                    'Category': chunk.get('category', ''),
-                    'Chunk Type': chunk.get('chunk_type', ''),
-                    'Content': chunk.get('text', ''),
-                    'Extraction Date': extraction_timestamp
-                }
-                rows.append(row)
+            for chunk in doc.get('information_chunks', []):
+                category = chunk.get('category', 'uncategorized')
+                category_data.setdefault(category, []).append(
+                    (category, chunk.get('text', ''), source_file, section_name)
+                )
         
-        return rows
+        for items in category_data.values():
+            yield from items
+
+    @staticmethod
+    def iter_csv(header: Tuple, rows: Iterable[Tuple]) -> Iterator[str]:
+        """Encode rows as CSV text, yielding it in batches of roughly CSV_STREAM_FLUSH_SIZE"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= CSV_STREAM_FLUSH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
     
     def generate_csv_content(self, rows: List[Dict[str, Any]]) -> str:
         """
@@ -215,32 +253,11 @@ class DocumentToCSVService:
             }
         
         # Organize by category
-        category_data = {}
-        
-        for doc in documents:
-            chunks = doc.get('information_chunks', [])
-            source_file = doc.get('source_file', 'Unknown')
-            section_name = doc.get('section', 'Unknown')
-            
-            for chunk in chunks:
-                category = chunk.get('category', 'uncategorized')
-                text = chunk.get('text', '')
-                
-                if category not in category_data:
-                    category_data[category] = []
-                
-                category_data[category].append({
-                    'Category': category,
-                    'Information': text,
-                    'Source File': source_file,
-                    'Section': section_name
-                })
-        
-        # Flatten to rows
-        rows = []
-        for category, items in category_data.items():
-            for item in items:
-                rows.append(item)
+        rows = [
+            dict(zip(CATEGORIZED_CSV_HEADER, row))
+            for row in self.iter_categorized_rows(documents)
+        ]
+        categories = list(dict.fromkeys(row['Category'] for row in rows))
         
         # Generate CSV
         csv_content = self.generate_csv_content(rows)
@@ -249,8 +266,8 @@ class DocumentToCSVService:
             'status': 'success',
             'csv_content': csv_content,
             'total_documents': len(documents),
-            'total_categories': len(category_data),
-            'categories': list(category_data.keys()),
+            'total_categories': len(categories),
+            'categories': categories,
             'section': section or 'all',
             'generated_at': datetime.now().isoformat()
         }
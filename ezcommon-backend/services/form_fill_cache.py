@@ -0,0 +1,97 @@
+"""
+Form Fill Cache
+Caches fill_multiple_fields results for repeated form fills
+"""
+import copy
+import os
+import threading
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from cachetools import TTLCache
+
+
+FORM_FILL_CACHE_TTL = int(os.environ.get("FORM_FILL_CACHE_TTL", str(7 * 24 * 3600)))
+FORM_FILL_CACHE_MAX_USERS = int(os.environ.get("FORM_FILL_CACHE_MAX_USERS", "1024"))
+
+
+class FormFillCache:
+    """In-process cache of form fill results, grouped per user
+
+    Entries are keyed by the section, the optimization flag and the
+    normalized set of field definitions, so the same form submitted with
+    fields in a different order (or with cosmetic whitespace/case changes in
+    category and source) is served from cache. A user's entries are dropped
+    whenever new documents are parsed for them.
+
+    Each process has its own cache, so entries are also tagged with the
+    user's documents version from ``version_source`` (a shared stamp bumped
+    on every parse or delete); an entry built against an older version is a
+    miss in every worker, not just the one that saw the change.
+    """
+
+    def __init__(self, ttl: int = FORM_FILL_CACHE_TTL, max_users: int = FORM_FILL_CACHE_MAX_USERS,
+                 version_source: Optional[Callable[[str], int]] = None):
+        self._users: TTLCache = TTLCache(maxsize=max_users, ttl=ttl)
+        self._lock = threading.Lock()
+        self._version_source = version_source
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(field_definitions: List[Any], section: Optional[str],
+                 use_optimization: bool) -> Tuple:
+        """Build an order-independent key for a set of field definitions"""
+        fields = tuple(sorted(
+            (
+                field_def.name,
+                ' '.join(field_def.category.lower().split()),
+                ' '.join(field_def.source.lower().split()),
+            )
+            for field_def in field_definitions
+        ))
+        return (section, use_optimization, fields)
+
+    def current_version(self, user_id: str) -> Optional[int]:
+        """Read the user's shared documents version; None if it can't be read"""
+        if self._version_source is None:
+            return 0
+        try:
+            return self._version_source(user_id)
+        except Exception as e:
+            print(f"⚠ Could not read documents version for {user_id}: {e}")
+            return None
+
+    def get(self, user_id: str, key: Tuple, version: Optional[int] = 0) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None if missing or stale"""
+        with self._lock:
+            entry = self._users.get(user_id)
+            result = None
+            if version is not None and entry is not None and entry[0] == version:
+                result = entry[1].get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def set(self, user_id: str, key: Tuple, result: Dict[str, Any], version: Optional[int] = 0) -> None:
+        """Store a copy of ``result`` built against documents ``version``"""
+        if version is None:
+            return
+        result = copy.deepcopy(result)
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None or entry[0] != version:
+                entry = (version, {})
+                self._users[user_id] = entry
+            entry[1][key] = result
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop all cached results for a user (e.g. after new documents are parsed)"""
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
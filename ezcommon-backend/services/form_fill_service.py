@@ -4,23 +4,30 @@ Extracts field values from parsed document chunks using LLM
 """
 import os
 import boto3
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from opensearchpy import OpenSearch, RequestsHttpConnection
 from requests_aws4auth import AWS4Auth
 import json
 from pathlib import Path
 from config import ConfigLoader
+from services.form_fill_cache import FormFillCache
+
+# Maximum concurrent LLM extractions per fill_multiple_fields call
+FORM_FILL_MAX_WORKERS = int(os.environ.get('FORM_FILL_MAX_WORKERS', '8'))
 
 
 class FormFillService:
     """Service for filling form fields using document chunks and LLM"""
     
-    def __init__(self, search_provider=None, llm_provider=None):
+    def __init__(self, search_provider=None, llm_provider=None, cache_version_source=None):
         """Initialize the form fill service
         
         Args:
             search_provider: Search provider instance (OpenSearch or ChromaDB)
             llm_provider: LLM provider instance for form field extraction
+            cache_version_source: Optional callable returning a user's shared
+                documents version, used to expire cached fills in every worker
         """
         # AWS Configuration
         self.aws_region = os.environ.get('AWS_REGION', 'us-east-1')
@@ -30,6 +37,9 @@ class FormFillService:
 
         # Use injected LLM provider
         self.llm_provider = llm_provider
+
+        # Cache for repeated fill_multiple_fields requests
+        self.cache = FormFillCache(version_source=cache_version_source)
         
         # Load general questions
         self.general_questions = self._load_general_questions()
@@ -239,20 +249,30 @@ Return ONLY the extracted value, nothing else.
 
 ## EXTRACTED VALUE:"""
     
-    def fill_multiple_fields(self, user_id: str, field_definitions: List[Dict[str, str]], 
-                            section: Optional[str] = None, use_optimization: bool = True) -> Dict[str, Any]:
+    def fill_multiple_fields(self, user_id: str, field_definitions: List[Any], 
+                            section: Optional[str] = None, use_optimization: bool = True,
+                            bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Fill multiple form fields for a user
         
         Args:
             user_id: User ID
-            field_definitions: List of field definitions with 'name', 'category', 'source'
+            field_definitions: List of field definitions exposing name, category
+                and source attributes (e.g. the API's FieldDefinition model)
             section: Optional section filter
             use_optimization: If False, skip chunk optimization (default: True)
+            bypass_cache: If True, skip the result cache lookup (default: False)
             
         Returns:
             Dictionary with extraction results and statistics
         """
+        cache_key = self.cache.make_key(field_definitions, section, use_optimization)
+        cache_version = self.cache.current_version(user_id)
+        if not bypass_cache:
+            cached = self.cache.get(user_id, cache_key, cache_version)
+            if cached is not None:
+                return cached
+
         # Get user's document chunks
         all_chunks = self.get_user_chunks(user_id, section)
         
@@ -263,33 +283,37 @@ Return ONLY the extracted value, nothing else.
                 "results": {}
             }
         
-        # Extract each field
-        results = {}
-        found_count = 0
-        not_found_count = 0
-        
-        for field_def in field_definitions:
-            field_name = field_def.get('name', '')
-            field_category = field_def.get('category', '')
-            field_source = field_def.get('source', '')
-            
-            if not field_name:
-                continue
-            
-            # Optimize chunks for this field
-            optimized_chunks = self.optimize_chunks_for_field(all_chunks, field_category, 
-                                                             use_optimization=use_optimization)
-            
-            # Extract value
-            extracted_value = self.extract_field_value(
+        # Identical field definitions share one extraction, and fields in the
+        # same category share one optimized chunk list
+        fields = [(f.name, f.category, f.source) for f in field_definitions if f.name]
+        unique_fields = list(dict.fromkeys(fields))
+        chunks_by_category = {
+            category: self.optimize_chunks_for_field(all_chunks, category,
+                                                     use_optimization=use_optimization)
+            for category in {category for _, category, _ in unique_fields}
+        }
+
+        def extract(field: Tuple[str, str, str]) -> str:
+            field_name, field_category, field_source = field
+            return self.extract_field_value(
                 field_name=field_name,
                 field_category=field_category,
                 field_source=field_source,
-                chunks=optimized_chunks,
+                chunks=chunks_by_category[field_category],
                 user_id=user_id,
             )
-            
-            results[field_name] = extracted_value
+
+        # Run the per-field LLM calls concurrently instead of one after another
+        with ThreadPoolExecutor(max_workers=FORM_FILL_MAX_WORKERS) as executor:
+            extracted = dict(zip(unique_fields, executor.map(extract, unique_fields)))
+
+        results = {}
+        found_count = 0
+        not_found_count = 0
+        
+        for field in fields:
+            extracted_value = extracted[field]
+            results[field[0]] = extracted_value
             
             # Update statistics
             if "NOT FOUND" not in extracted_value.upper():
@@ -297,7 +321,7 @@ Return ONLY the extracted value, nothing else.
             else:
                 not_found_count += 1
         
-        return {
+        result = {
             "status": "success",
             "total_fields": len(field_definitions),
             "found_fields": found_count,
@@ -306,6 +330,8 @@ Return ONLY the extracted value, nothing else.
             "total_chunks_available": len(all_chunks),
             "results": results
         }
+        self.cache.set(user_id, cache_key, result, cache_version)
+        return result
     
     def fill_school_questions(self, user_id: str, school_id: str, use_optimization: bool = True) -> Dict[str, Any]:
         """
@@ -119,8 +119,17 @@ class BedrockProvider(LLMProvider):
     def vision_analysis(self, 
                        image_base64: str, 
                        prompt: str,
-                       model: Optional[str] = None) -> Dict[str, Any]:
+                       model: Optional[str] = None,
+                       media_type: str = "image/png") -> Dict[str, Any]:
         """Analyze image using Bedrock Vision (Claude with vision)"""
+        return self.vision_analysis_multi([image_base64], prompt, model, media_type)
+    
+    def vision_analysis_multi(self,
+                              images_base64: List[str],
+                              prompt: str,
+                              model: Optional[str] = None,
+                              media_type: str = "image/png") -> Dict[str, Any]:
+        """Analyze one or more images in a single Bedrock Vision (Claude) request"""
         if not self._initialized:
             raise RuntimeError("Bedrock provider not initialized")
         
@@ -128,19 +137,22 @@ class BedrockProvider(LLMProvider):
         model_id = self._extract_model_id(model)
         
         try:
-            # Prepare message with image
+            # Prepare message with one image block per image
             messages = [
                 {
                     "role": "user",
                     "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "image/png",
-                                "data": image_base64
+                        *(
+                            {
+                                "type": "image",
+                                "source": {
+                                    "type": "base64",
+                                    "media_type": media_type,
+                                    "data": image_base64
+                                }
                             }
-                        },
+                            for image_base64 in images_base64
+                        ),
                         {
                             "type": "text",
                             "text": prompt
@@ -149,10 +161,10 @@ class BedrockProvider(LLMProvider):
                 }
             ]
             
-            # Prepare request
+            # Prepare request (output budget grows with the number of pages)
             request_body = {
                 "messages": messages,
-                "max_tokens": 1024
+                "max_tokens": 1024 * len(images_base64)
             }
             
             # Call Bedrock
@@ -103,8 +103,17 @@ class GeminiProvider(LLMProvider):
     def vision_analysis(self, 
                        image_base64: str, 
                        prompt: str,
-                       model: Optional[str] = None) -> Dict[str, Any]:
+                       model: Optional[str] = None,
+                       media_type: str = "image/png") -> Dict[str, Any]:
         """Analyze image using Gemini Vision"""
+        return self.vision_analysis_multi([image_base64], prompt, model, media_type)
+    
+    def vision_analysis_multi(self,
+                              images_base64: List[str],
+                              prompt: str,
+                              model: Optional[str] = None,
+                              media_type: str = "image/png") -> Dict[str, Any]:
+        """Analyze one or more images in a single Gemini Vision request"""
         if not self._initialized:
             raise RuntimeError("Gemini provider not initialized")
         
@@ -115,15 +124,14 @@ class GeminiProvider(LLMProvider):
             from PIL import Image
             import io
             
-            # Decode base64 image
-            image_data = base64.b64decode(image_base64)
-            image = Image.open(io.BytesIO(image_data))
+            # Decode base64 images
+            images = [Image.open(io.BytesIO(base64.b64decode(image_base64))) for image_base64 in images_base64]
             
             # Create model
             gemini_model = genai.GenerativeModel(model)
             
-            # Generate response with image and prompt
-            response = gemini_model.generate_content([prompt, image])
+            # Generate response with images and prompt
+            response = gemini_model.generate_content([prompt, *images])
             
             return {
                 'content': response.text,
@@ -49,10 +49,13 @@ class LLMProvider(ABC):
     def vision_analysis(self, 
                        image_base64: str, 
                        prompt: str,
-                       model: Optional[str] = None) -> Dict[str, Any]:
+                       model: Optional[str] = None,
+                       media_type: str = "image/png") -> Dict[str, Any]:
         """
         Analyze image with vision model
         
+        media_type is the MIME type of the encoded image (e.g. image/jpeg)
+        
         Returns:
             {
                 'content': str,
@@ -61,6 +64,28 @@ class LLMProvider(ABC):
         """
         pass
     
+    def vision_analysis_multi(self,
+                              images_base64: List[str],
+                              prompt: str,
+                              model: Optional[str] = None,
+                              media_type: str = "image/png") -> Dict[str, Any]:
+        """
+        Analyze several images in one vision request
+        
+        Providers whose models accept multiple images override this; the
+        default only handles a single image and raises NotImplementedError
+        otherwise, so callers can fall back to one request per image.
+        
+        Returns:
+            {
+                'content': str,
+                'model': str
+            }
+        """
+        if len(images_base64) == 1:
+            return self.vision_analysis(images_base64[0], prompt, model, media_type)
+        raise NotImplementedError(f"{type(self).__name__} does not support multi-image vision requests")
+    
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the LLM provider is available and configured"""
@@ -110,8 +110,17 @@ class OpenAIProvider(LLMProvider):
     def vision_analysis(self, 
                        image_base64: str, 
                        prompt: str,
-                       model: Optional[str] = None) -> Dict[str, Any]:
+                       model: Optional[str] = None,
+                       media_type: str = "image/png") -> Dict[str, Any]:
         """Analyze image using OpenAI Vision API"""
+        return self.vision_analysis_multi([image_base64], prompt, model, media_type)
+    
+    def vision_analysis_multi(self,
+                              images_base64: List[str],
+                              prompt: str,
+                              model: Optional[str] = None,
+                              media_type: str = "image/png") -> Dict[str, Any]:
+        """Analyze one or more images in a single OpenAI Vision API request"""
         if not self._initialized:
             raise RuntimeError("OpenAI provider not initialized")
         
@@ -124,12 +133,15 @@ class OpenAIProvider(LLMProvider):
                     {
                         "role": "user",
                         "content": [
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{image_base64}"
+                            *(
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": f"data:{media_type};base64,{image_base64}"
+                                    }
                                 }
-                            },
+                                for image_base64 in images_base64
+                            ),
                             {
                                 "type": "text",
                                 "text": prompt
@@ -9,6 +9,37 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 
+def user_output_dir(output_dir: Path, user_id: str) -> Path:
+    """Directory holding one user's outputs: {output_dir}/{user_id}/"""
+    user_id = str(user_id)
+    if not user_id or user_id in (".", "..") or Path(user_id).name != user_id:
+        raise ValueError(f"Invalid user_id for output path: {user_id!r}")
+    return output_dir / user_id
+
+
+def migrate_flat_outputs(output_dir: Path) -> int:
+    """
+    Move outputs saved by older versions directly in output_dir into their
+    per-user directory, using the user_id recorded in each file's metadata
+    
+    Returns:
+        Number of files moved
+    """
+    moved = 0
+    for filepath in output_dir.glob("*.json"):
+        try:
+            user_id = json.loads(filepath.read_bytes())["metadata"]["user_id"]
+            target_dir = user_output_dir(output_dir, user_id)
+            target_dir.mkdir(exist_ok=True)
+            filepath.replace(target_dir / filepath.name)
+            moved += 1
+        except Exception as e:
+            print(f"⚠ Could not migrate {filepath}: {e}")
+    if moved:
+        print(f"✓ Moved {moved} output file(s) into per-user directories")
+    return moved
+
+
 class SchoolFormOutputService:
     """Service for saving and managing filled school form JSON outputs"""
     
@@ -17,8 +48,16 @@ class SchoolFormOutputService:
         # Create output directory if it doesn't exist
         self.output_dir = Path(__file__).parent.parent / "config" / "outputs"
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        migrate_flat_outputs(self.output_dir)
         print(f"✓ School form output directory: {self.output_dir}")
     
+    def _user_path(self, user_id: str, filename: str, create: bool = False) -> Path:
+        """Path of a user's output file (outputs/{user_id}/{filename})"""
+        user_dir = user_output_dir(self.output_dir, user_id)
+        if create:
+            user_dir.mkdir(exist_ok=True)
+        return user_dir / filename
+    
     def save_or_return_json(self, user_id: str, school_id: str, 
                            filled_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -35,7 +74,7 @@ class SchoolFormOutputService:
         try:
             # Generate filename
             filename = f"filled_form_user_{user_id}_school_{school_id}.json"
-            filepath = self.output_dir / filename
+            filepath = self._user_path(user_id, filename, create=True)
             
             # Prepare output data with metadata
             output_data = {
@@ -90,7 +129,7 @@ class SchoolFormOutputService:
         """
         try:
             filename = f"filled_form_user_{user_id}_school_{school_id}.json"
-            filepath = self.output_dir / filename
+            filepath = self._user_path(user_id, filename)
             
             if not filepath.exists():
                 return None
@@ -138,7 +177,7 @@ class SchoolFormOutputService:
         """
         try:
             filename = f"filled_form_user_{user_id}_school_{school_id}.json"
-            filepath = self.output_dir / filename
+            filepath = self._user_path(user_id, filename)
             
             if filepath.exists():
                 filepath.unlink()
@@ -166,7 +205,7 @@ class SchoolFormOutputService:
         try:
             pattern = f"filled_form_user_{user_id}_school_*.json"
             
-            for filepath in self.output_dir.glob(pattern):
+            for filepath in user_output_dir(self.output_dir, user_id).glob(pattern):
                 try:
                     with open(filepath, 'r', encoding='utf-8') as f:
                         data = json.load(f)
@@ -203,7 +242,7 @@ class SchoolFormOutputService:
         try:
             # Generate filename
             filename = f"general_questions_user_{user_id}.json"
-            filepath = self.output_dir / filename
+            filepath = self._user_path(user_id, filename, create=True)
             
             # Prepare output data with metadata
             output_data = {
@@ -255,7 +294,7 @@ class SchoolFormOutputService:
         """
         try:
             filename = f"general_questions_user_{user_id}.json"
-            filepath = self.output_dir / filename
+            filepath = self._user_path(user_id, filename)
             
             if not filepath.exists():
                 return None
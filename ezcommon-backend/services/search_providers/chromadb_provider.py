@@ -1,8 +1,12 @@
 """ChromaDB implementation of SearchProvider"""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .search_interface import SearchProvider
 
+# Batch size for clients without get_max_batch_size() (early chromadb 0.4.x);
+# safely under the SQLite variable limit those versions hit
+DEFAULT_MAX_BATCH_SIZE = 5000
+
 
 class ChromaDBProvider(SearchProvider):
     """ChromaDB provider for document search and storage"""
@@ -43,41 +47,64 @@ class ChromaDBProvider(SearchProvider):
             print(f"⚠ ChromaDB initialization failed: {e}")
             self._initialized = False
     
+    @staticmethod
+    def _chunk_records(document_id: str, document: Dict[str, Any]):
+        """Yield (id, content, metadata) for each chunk of a document"""
+        user_id = document.get('user_id', 'unknown')
+        source_file = document.get('source_file', 'unknown')
+        section = document.get('section', 'unknown')
+        file_type = document.get('file_type', 'unknown')
+        
+        for idx, chunk in enumerate(document.get('information_chunks', [])):
+            # Handle both 'content' field (semantic blocks) and 'text' field (naive chunks)
+            content = chunk.get('content') or chunk.get('text', '')
+            yield f"{document_id}_chunk_{idx}", content, {
+                "user_id": user_id,
+                "source_file": source_file,
+                "section": section,
+                "file_type": file_type,
+                "category": chunk.get('category', ''),
+                "chunk_index": idx
+            }
+    
+    def _add_records(self, records: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Add chunk records with as few collection.add calls as the client allows"""
+        if not records:
+            return
+        get_max_batch_size = getattr(self.client, "get_max_batch_size", None)
+        batch_size = get_max_batch_size() if get_max_batch_size else DEFAULT_MAX_BATCH_SIZE
+        for start in range(0, len(records), batch_size):
+            ids, documents, metadatas = zip(*records[start:start + batch_size])
+            self.collection.add(ids=list(ids), documents=list(documents), metadatas=list(metadatas))
+    
     def store_document(self, document_id: str, document: Dict[str, Any]) -> bool:
         """Store document in ChromaDB"""
         if not self.collection or not self._initialized:
             return False
         
         try:
-            chunks = document.get('information_chunks', [])
-            user_id = document.get('user_id', 'unknown')
-            source_file = document.get('source_file', 'unknown')
-            section = document.get('section', 'unknown')
-            file_type = document.get('file_type', 'unknown')
-            
-            for idx, chunk in enumerate(chunks):
-                chunk_id = f"{document_id}_chunk_{idx}"
-                # Handle both 'content' field (semantic blocks) and 'text' field (naive chunks)
-                content = chunk.get('content') or chunk.get('text', '')
-                
-                self.collection.add(
-                    ids=[chunk_id],
-                    documents=[content],
-                    metadatas=[{
-                        "user_id": user_id,
-                        "source_file": source_file,
-                        "section": section,
-                        "file_type": file_type,
-                        "category": chunk.get('category', ''),
-                        "chunk_index": idx
-                    }]
-                )
-            
+            self._add_records(list(self._chunk_records(document_id, document)))
             return True
         except Exception as e:
             print(f"Error storing document: {e}")
             return False
     
+    def store_documents(self, documents: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Store many documents in ChromaDB with batched collection.add calls"""
+        if not documents or not self.collection or not self._initialized:
+            return 0
+        
+        try:
+            self._add_records([
+                record
+                for document_id, document in documents
+                for record in self._chunk_records(document_id, document)
+            ])
+            return len(documents)
+        except Exception as e:
+            print(f"Error storing documents: {e}")
+            return 0
+    
     def get_documents_by_user(self, user_id: str, section: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve documents for a user"""
         if not self.collection or not self._initialized:
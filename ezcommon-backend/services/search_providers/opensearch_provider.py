@@ -1,11 +1,19 @@
 """OpenSearch implementation of SearchProvider"""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .search_interface import SearchProvider
 import boto3
-from opensearchpy import OpenSearch, RequestsHttpConnection
+from opensearchpy import OpenSearch, RequestsHttpConnection, helpers
 from requests_aws4auth import AWS4Auth
 
+# Bulk indexing limits per request
+BULK_CHUNK_SIZE = 500
+BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+BULK_REQUEST_TIMEOUT = 60
+
+# Fewer translog flushes while ingesting; merged into new index settings
+INDEX_TRANSLOG_SETTINGS = {"flush_threshold_size": "1gb"}
+
 
 class OpenSearchProvider(SearchProvider):
     """OpenSearch provider for document search and storage"""
@@ -20,11 +28,15 @@ class OpenSearchProvider(SearchProvider):
                 - OPENSEARCH_REGION: AWS region
                 - OPENSEARCH_INDEX: Index name
                 - OPENSEARCH_PORT: Port number
+                - OPENSEARCH_REFRESH_INTERVAL: Refresh interval for a newly
+                  created index (default 1s; longer means cheaper bulk
+                  writes but parsed chunks take that long to show up)
         """
         self.host = config.get('OPENSEARCH_HOST')
         self.region = config.get('OPENSEARCH_REGION', 'us-east-1')
         self.index_name = config.get('OPENSEARCH_INDEX', 'document_chunks')
         self.port = config.get('OPENSEARCH_PORT', 443)
+        self.refresh_interval = config.get('OPENSEARCH_REFRESH_INTERVAL', '1s')
         
         self.client = None
         self._initialized = False
@@ -81,7 +93,9 @@ class OpenSearchProvider(SearchProvider):
                     body={
                         "settings": {
                             "number_of_shards": 1,
-                            "number_of_replicas": 1
+                            "number_of_replicas": 1,
+                            "refresh_interval": self.refresh_interval,
+                            "translog": INDEX_TRANSLOG_SETTINGS
                         },
                         "mappings": {
                             "properties": {
@@ -121,6 +135,31 @@ class OpenSearchProvider(SearchProvider):
             print(f"Error storing document: {e}")
             return False
     
+    def store_documents(self, documents: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Store many documents in OpenSearch with the bulk API"""
+        if not documents or not self.client or not self._initialized:
+            return 0
+        
+        actions = (
+            {"_op_type": "index", "_index": self.index_name, "_id": document_id, "_source": document}
+            for document_id, document in documents
+        )
+        try:
+            stored, errors = helpers.bulk(
+                self.client,
+                actions,
+                chunk_size=BULK_CHUNK_SIZE,
+                max_chunk_bytes=BULK_MAX_CHUNK_BYTES,
+                request_timeout=BULK_REQUEST_TIMEOUT,
+                raise_on_error=False,
+            )
+            if errors:
+                print(f"⚠ {len(errors)} document(s) failed to index, first error: {errors[0]}")
+            return stored
+        except Exception as e:
+            print(f"Error bulk storing documents: {e}")
+            return 0
+    
     def get_documents_by_user(self, user_id: str, section: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve documents for a user"""
         if not self.client or not self._initialized:
@@ -1,7 +1,7 @@
 """Abstract base class for search providers"""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 
 class SearchProvider(ABC):
@@ -26,6 +26,21 @@ class SearchProvider(ABC):
         """
         pass
     
+    def store_documents(self, documents: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Store many documents at once
+        
+        Providers with a batch write API override this; the default stores
+        them one by one.
+        
+        Args:
+            documents: List of (document_id, document) pairs
+            
+        Returns:
+            Number of documents stored
+        """
+        return sum(1 for document_id, document in documents if self.store_document(document_id, document))
+    
     @abstractmethod
     def get_documents_by_user(self, user_id: str, section: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -4,8 +4,10 @@ Handles file uploads to AWS S3
 """
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 from enum import Enum
+import asyncio
 import os
 
 from s3_service import get_s3_service
@@ -19,7 +21,8 @@ CORS_ORIGINS = os.environ.get(
 app = FastAPI(
     title="EZ Common Upload API",
     description="File upload service for EZ Common application",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -87,12 +90,11 @@ async def upload_files(
     
     for file in files:
         try:
-            # Read file content
-            content = await file.read()
-            
-            # Upload to S3
-            result = s3_service.upload_file(
-                file_content=content,
+            # Stream the spooled upload to S3 (multipart for large files)
+            # in a worker thread instead of reading it into memory
+            result = await asyncio.to_thread(
+                s3_service.upload_file,
+                file_content=file.file,
                 filename=file.filename or "unnamed",
                 user_id=user_id,
                 section=section.value,
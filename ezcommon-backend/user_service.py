@@ -2,20 +2,45 @@
 User Service for DynamoDB
 Handles user CRUD operations with DynamoDB
 """
-from typing import Optional, Dict, Any, List, Union
+from typing import Collection, Optional, Dict, Any, List, Union
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import time
 from uuid import uuid4
 from decimal import Decimal
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 from passlib.context import CryptContext
-from aws_config import DYNAMODB_USERS_TABLE, get_dynamodb_resource
+from aws_config import (
+    DYNAMODB_USERS_TABLE,
+    DYNAMODB_USERS_EMAIL_INDEX,
+    DYNAMODB_USERS_NAME_INDEX,
+    get_dynamodb_resource,
+)
 
 # Password hashing context (same as backend for compatibility)
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 _UNSET = object()
 
+# Attributes returned by student search (never includes password_hash or the
+# internal fields below)
+STUDENT_SEARCH_PROJECTION = "id, email, first_name, last_name, #r, org_id, created_at"
+
+# Every public attribute, for reads whose result is returned as-is
+PUBLIC_USER_PROJECTION = STUDENT_SEARCH_PROJECTION + ", updated_at"
+
+# Stored on user records but never returned by the API: the password hash,
+# the normalized GSI keys and the form-fill cache version stamp
+INTERNAL_USER_FIELDS = frozenset({"password_hash", "email_lower", "name_lower", "documents_version"})
+
+# DynamoDB BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_RETRIES = 5
+# Parallel get_item calls used when BatchGetItem itself fails
+GET_ITEM_FANOUT_WORKERS = 16
+
 
 def _convert_to_dynamo_value(value: Any):
     """Recursively convert floats to Decimal for DynamoDB compatibility."""
@@ -28,6 +53,11 @@ def _convert_to_dynamo_value(value: Any):
     return value
 
 
+def _name_lower(first_name: str, last_name: str) -> str:
+    """Normalized full name stored for case-insensitive prefix search."""
+    return f"{first_name} {last_name}".strip().lower()
+
+
 def _to_decimal(value: Union[Decimal, float, int, str, None], default: str = "0") -> Decimal:
     """Safely coerce supported numeric inputs into Decimal."""
     if value is None:
@@ -99,6 +129,8 @@ class UserService:
             "email": email,
             "first_name": first_name,
             "last_name": last_name,
+            # Normalized copies backing the search GSIs
+            "email_lower": email,
             "password_hash": self.hash_password(password),
             "created_at": now,
             "updated_at": now,
@@ -107,6 +139,12 @@ class UserService:
             "org_id": org_id,
         }
 
+        # DynamoDB rejects empty strings for GSI keys, so a nameless user
+        # is simply left out of the name index
+        name_lower = _name_lower(first_name, last_name)
+        if name_lower:
+            user_data["name_lower"] = name_lower
+
         try:
             self.table.put_item(Item=user_data)
             return self._sanitize_user(user_data)
@@ -114,10 +152,11 @@ class UserService:
             print(f"Error creating user: {e}")
             return None
 
-    def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+    def get_user_by_email(self, email: str, projection: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get user by email using GSI
         Returns user data if found, None otherwise
+        Pass ``projection`` (e.g. PUBLIC_USER_PROJECTION) to fetch only those attributes
         """
         email = email.lower().strip()
         
@@ -127,7 +166,8 @@ class UserService:
                 KeyConditionExpression='email = :email',
                 ExpressionAttributeValues={
                     ':email': email
-                }
+                },
+                **self._projection_kwargs(projection)
             )
             
             items = response.get('Items', [])
@@ -139,18 +179,96 @@ class UserService:
             print(f"Error querying user by email: {e}")
             return None
     
-    def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+    def get_user_by_id(self, user_id: str, projection: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get user by ID
         Returns user data if found, None otherwise
+        Pass ``projection`` (e.g. PUBLIC_USER_PROJECTION) to fetch only those attributes
         """
         try:
-            response = self.table.get_item(Key={'id': user_id})
+            response = self.table.get_item(Key={'id': user_id}, **self._projection_kwargs(projection))
             return response.get('Item')
         except ClientError as e:
             print(f"Error getting user by ID: {e}")
             return None
     
+    def get_users_by_ids(self, user_ids: List[str],
+                         projection: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get many users by ID with BatchGetItem
+        Returns a dict of user_id -> user data for the users that exist
+        """
+        unique_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+        batches = [
+            unique_ids[i:i + BATCH_GET_MAX_KEYS]
+            for i in range(0, len(unique_ids), BATCH_GET_MAX_KEYS)
+        ]
+        if not batches:
+            return {}
+
+        users: Dict[str, Dict[str, Any]] = {}
+        if len(batches) == 1:
+            results = [self._batch_get_users(batches[0], projection)]
+        else:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(
+                    lambda batch: self._batch_get_users(batch, projection), batches
+                ))
+        for items in results:
+            for item in items:
+                users[item['id']] = item
+        return users
+
+    def _batch_get_users(self, user_ids: List[str],
+                         projection: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetch one batch of up to 100 users, retrying unprocessed keys with backoff."""
+        table_name = self.table.name
+        request = {table_name: {
+            'Keys': [{'id': uid} for uid in user_ids],
+            **self._projection_kwargs(projection),
+        }}
+        items: List[Dict[str, Any]] = []
+        try:
+            for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                items.extend(response.get('Responses', {}).get(table_name, []))
+                request = response.get('UnprocessedKeys') or {}
+                if not request:
+                    break
+                time.sleep(min(0.05 * (2 ** attempt), 1.0))
+            else:
+                print(f"Warning: {len(request[table_name]['Keys'])} user keys left unprocessed")
+        except ClientError as e:
+            print(f"Error batch getting users, falling back to get_item: {e}")
+            fetched = {item['id'] for item in items}
+            items.extend(self._get_users_individually(
+                [uid for uid in user_ids if uid not in fetched], projection
+            ))
+        return items
+
+    def get_users_by_emails(self, emails: List[str],
+                            projection: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get many users by email
+        BatchGetItem cannot read a GSI, so the email-index queries are overlapped
+        on a thread pool. Returns a dict of normalized email -> user data.
+        """
+        unique_emails = list(dict.fromkeys(e.lower().strip() for e in emails if e))
+        if not unique_emails:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(GET_ITEM_FANOUT_WORKERS, len(unique_emails))) as executor:
+            users = executor.map(lambda email: self.get_user_by_email(email, projection), unique_emails)
+            return {email: user for email, user in zip(unique_emails, users) if user}
+
+    def _get_users_individually(self, user_ids: List[str],
+                                projection: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Overlap one get_item per user on a thread pool (the connection pool is shared)."""
+        if not user_ids:
+            return []
+        with ThreadPoolExecutor(max_workers=min(GET_ITEM_FANOUT_WORKERS, len(user_ids))) as executor:
+            users = executor.map(lambda uid: self.get_user_by_id(uid, projection), user_ids)
+            return [user for user in users if user]
+
     def authenticate_user(self, email: str, password: str) -> Optional[Dict[str, Any]]:
         """
         Authenticate user with email and password
@@ -179,6 +297,7 @@ class UserService:
         """
         # Build update expression
         update_parts = []
+        remove_parts = []
         expression_values = {}
         
         if first_name is not None:
@@ -189,6 +308,19 @@ class UserService:
             update_parts.append('last_name = :ln')
             expression_values[':ln'] = last_name
         
+        if first_name is not None or last_name is not None:
+            if first_name is None or last_name is None:
+                current = self.get_user_by_id(user_id) or {}
+                first_name = current.get('first_name', '') if first_name is None else first_name
+                last_name = current.get('last_name', '') if last_name is None else last_name
+            name_lower = _name_lower(first_name, last_name)
+            if name_lower:
+                update_parts.append('name_lower = :nl')
+                expression_values[':nl'] = name_lower
+            else:
+                # Empty GSI keys are rejected; drop the user from the name index
+                remove_parts.append('name_lower')
+        
         if password is not None:
             update_parts.append('password_hash = :ph')
             expression_values[':ph'] = self.hash_password(password)
@@ -201,6 +333,8 @@ class UserService:
         expression_values[':ua'] = datetime.now(timezone.utc).isoformat()
         
         update_expression = 'SET ' + ', '.join(update_parts)
+        if remove_parts:
+            update_expression += ' REMOVE ' + ', '.join(remove_parts)
         
         try:
             response = self.table.update_item(
@@ -216,6 +350,30 @@ class UserService:
             print(f"Error updating user: {e}")
             return None
     
+    def get_documents_version(self, user_id: str) -> int:
+        """Return the user's documents version (0 if never bumped)"""
+        response = self.table.get_item(
+            Key={'id': user_id},
+            ProjectionExpression='documents_version',
+        )
+        return int(response.get('Item', {}).get('documents_version', 0))
+
+    def bump_documents_version(self, user_id: str) -> None:
+        """Atomically increment the user's documents version
+
+        Other processes compare this stamp against their cached form fills, so
+        bumping it expires those fills everywhere.
+        """
+        try:
+            self.table.update_item(
+                Key={'id': user_id},
+                UpdateExpression='ADD documents_version :one',
+                ConditionExpression='attribute_exists(id)',
+                ExpressionAttributeValues={':one': 1},
+            )
+        except ClientError as e:
+            print(f"Error bumping documents version: {e}")
+
     def delete_user(self, user_id: str) -> bool:
         """
         Delete a user
@@ -246,13 +404,80 @@ class UserService:
             print(f"Error listing users: {e}")
             return []
 
+    def search_by_email_prefix(self, prefix: str, limit: int = 20, role: str = "student") -> List[Dict[str, Any]]:
+        """Find users of a role whose email starts with ``prefix`` (case-insensitive)."""
+        return self._query_prefix(DYNAMODB_USERS_EMAIL_INDEX, "email_lower", prefix, limit, role)
+
+    def search_by_name_prefix(self, prefix: str, limit: int = 20, role: str = "student") -> List[Dict[str, Any]]:
+        """Find users of a role whose full name starts with ``prefix`` (case-insensitive)."""
+        return self._query_prefix(DYNAMODB_USERS_NAME_INDEX, "name_lower", prefix, limit, role)
+
+    def search_students_containing(self, substring: str, limit: int = 20,
+                                   exclude_ids: Collection[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Find up to ``limit`` students whose email or full name contains ``substring``
+        Pages through the role-filtered, projected scan until enough matches
+        are found, so results don't depend on table size; in the worst case
+        that is a full table scan. Legacy records with no role count as
+        students, and names are normalized here so records that predate
+        name_lower still match.
+        """
+        q = substring.strip().lower()
+        scan_kwargs = {
+            'FilterExpression': Attr('role').eq('student') | Attr('role').not_exists(),
+            **self._projection_kwargs(STUDENT_SEARCH_PROJECTION),
+        }
+        matches: List[Dict[str, Any]] = []
+        try:
+            while True:
+                response = self.table.scan(**scan_kwargs)
+                for user in response.get('Items', []):
+                    if user['id'] in exclude_ids:
+                        continue
+                    email_lower = str(user.get('email', '')).lower()
+                    name_lower = _name_lower(user.get('first_name', ''), user.get('last_name', ''))
+                    if q in email_lower or q in name_lower:
+                        matches.append(user)
+                        if len(matches) >= limit:
+                            return matches
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                scan_kwargs['ExclusiveStartKey'] = last_key
+        except ClientError as e:
+            print(f"Error scanning students: {e}")
+        return matches
+
+    def _query_prefix(self, index_name: str, attribute: str, prefix: str,
+                      limit: int, role: str) -> List[Dict[str, Any]]:
+        try:
+            response = self.table.query(
+                IndexName=index_name,
+                KeyConditionExpression=Key('role').eq(role) & Key(attribute).begins_with(prefix.strip().lower()),
+                Limit=limit,
+                # The GSIs project ALL attributes; only fetch the public ones
+                **self._projection_kwargs(STUDENT_SEARCH_PROJECTION),
+            )
+            return [self._sanitize_user(item) for item in response.get('Items', [])]
+        except ClientError as e:
+            print(f"Error querying {index_name}: {e}")
+            return []
+
+    @staticmethod
+    def _projection_kwargs(projection: Optional[str]) -> Dict[str, Any]:
+        """Request kwargs for an optional projection (``#r`` aliases the reserved word role)."""
+        if not projection:
+            return {}
+        kwargs: Dict[str, Any] = {'ProjectionExpression': projection}
+        if '#r' in projection:
+            kwargs['ExpressionAttributeNames'] = {'#r': 'role'}
+        return kwargs
+
     def _sanitize_user(self, user: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Remove sensitive fields before returning user objects."""
+        """Remove sensitive and internal fields before returning user objects."""
         if not user:
             return None
-        user_copy = dict(user)
-        user_copy.pop("password_hash", None)
-        return user_copy
+        return {k: v for k, v in user.items() if k not in INTERNAL_USER_FIELDS}
 
 
 # Example usage and testing